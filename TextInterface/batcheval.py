@@ -0,0 +1,54 @@
+from gameboard import BoardClass
+from gameboard import EMPTY, X_PIECE, O_PIECE
+from gameboard import PIECE_VALUES
+import numpy as np
+
+# The tile indices (tile - 1) of the 8 lines of the 3x3 board: 3 rows, 3 columns, and 2 diagonals.
+WIN_LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6]
+], dtype=np.intp)
+
+def boardArray(playerBoards: list[BoardClass]) -> np.ndarray:
+    """Pack the positions of 3x3 BoardClass game boards into one array for evaluateBoards.
+
+    playerBoards: The BoardClass type objects holding the positions.
+
+    Returns: An (N, 9) int8 array with a row per game board, EMPTY, X_PIECE, or O_PIECE for each tile in tile order.
+    """
+    boards = np.zeros((len(playerBoards), 9), dtype=np.int8)
+
+    for row, playerBoard in enumerate(playerBoards):
+        for tile in range(1, 10):
+            boards[row, tile - 1] = PIECE_VALUES[playerBoard.getGameBoardTile(tile)]
+
+    return boards
+
+def evaluateBoards(boards: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate many 3x3 positions at once with array operations over the WIN_LINES index array.
+
+    boards: An (N, 9) int8 array with a row per position, EMPTY, X_PIECE, or O_PIECE for each tile in tile order.
+
+    Returns: A tuple of three arrays with a row per position:
+        winner: (N,) int8 array of X_PIECE or O_PIECE for the piece with 3 aligned, EMPTY if neither has.
+        If both pieces have a line, which no game can reach, winner is X_PIECE.
+        full: (N,) bool array, True if every tile holds a piece.
+        legalMoves: (N, 9) bool array, True for each empty tile of a position whose game is not over.
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    # (N, 8, 3) array of the pieces on every line of every position
+    lines = boards[:, WIN_LINES]
+    lineOwners = lines[:, :, 0]
+    # a line is complete if its 3 pieces match and are not empty
+    completeLines = (lineOwners != EMPTY) & (lineOwners == lines[:, :, 1]) & (lineOwners == lines[:, :, 2])
+
+    xWins = (completeLines & (lineOwners == X_PIECE)).any(axis=1)
+    oWins = (completeLines & (lineOwners == O_PIECE)).any(axis=1)
+    winner = np.where(xWins, X_PIECE, np.where(oWins, O_PIECE, EMPTY)).astype(np.int8)
+
+    emptyTiles = boards == EMPTY
+    full = ~emptyTiles.any(axis=1)
+    legalMoves = emptyTiles & (winner == EMPTY)[:, None]
+
+    return winner, full, legalMoves
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+# Number of positions kept by an EvaluationCache when no other budget is given, about 70 MB of MinimaxPlayer entries.
+DEFAULT_CACHE_ENTRIES = 2 ** 18
+
+class EvaluationCache:
+    """A class that keeps searched position values up to a fixed number of entries, evicting the least recently used.
+
+    Positions are keyed by any hashable value, such as a tuple holding the Zobrist key of a BoardClass, and
+    every entry is a small tuple, so a limit on the number of entries is a limit on memory. Once full, storing a new position
+    evicts the one that was read or stored longest ago, so a long-running server keeps the positions
+    of its current games instead of growing without limit. The hit, miss, and eviction counters show
+    whether the cache is large enough for its load.
+
+    Attributes:
+        maxEntries (int): The most positions kept at once.
+        entries (OrderedDict[object, tuple]): Maps a position key to its value, least recently used first.
+        hits (int): The number of lookups that found their position.
+        misses (int): The number of lookups that did not find their position.
+        evictions (int): The number of positions evicted to make room for new ones.
+    """
+
+    def __init__(self, maxEntries: int = DEFAULT_CACHE_ENTRIES):
+        if maxEntries < 1:
+            raise ValueError("EvaluationCache needs room for at least one entry.")
+
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: object) -> tuple:
+        """Look up the value of a position, marking it as the most recently used.
+
+        key: The key of the position.
+
+        Returns: The stored value, or None if the position is not in the cache.
+        """
+        value = self.entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: object, value: tuple) -> None:
+        """Store the value of a position as the most recently used, evicting the least recently used if full.
+
+        key: The key of the position.
+        value: The value to store, which must not be None.
+        """
+        entries = self.entries
+
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.maxEntries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+        entries[key] = value
+
+    def hitRate(self) -> float:
+        """Compute the share of lookups that found their position.
+
+        Returns: The fraction of lookups that were hits, or 0.0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Remove every position and reset the counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
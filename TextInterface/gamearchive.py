@@ -0,0 +1,291 @@
+from gamelog import GameRecord, DEFAULT_LOG_DIRECTORY, X_STARTS, packMoves, unpackMoves, readGames, replayGame
+from renderer import TextRenderer
+import argparse
+import mmap
+import os
+import struct
+
+# Default location of the archive, next to this file, with its index beside it.
+DEFAULT_ARCHIVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.archive")
+INDEX_SUFFIX = ".index"
+
+# The archive starts with a magic number and the sizes of the name and move fields, which are the same for
+# every record of an archive, so record n always starts at ARCHIVE_HEADER.size + (n - 1) * recordSize.
+ARCHIVE_MAGIC = b"TTTA"
+ARCHIVE_HEADER = struct.Struct("<4sHH")
+# Every record starts with its board size, win length, start player, number of moves, and result, followed by
+# the X and O user names padded with zero bytes to the name size, and the moves packed as in the game log.
+RECORD_FIELDS = struct.Struct("<BBBBB")
+
+# The index starts with a magic number and its number of players, followed by an entry for every player, sorted
+# by user name padded with zero bytes to the archive's name size, then the game ids of every player.
+INDEX_MAGIC = b"TTTI"
+INDEX_HEADER = struct.Struct("<4sI")
+# Every player entry is the padded user name followed by the position of the player's first game id among the
+# game ids, and the number of the player's games.
+PLAYER_FIELDS = struct.Struct("<II")
+GAME_ID = struct.Struct("<I")
+
+# Values of a record's result byte.
+TIE = 0
+X_WON = 1
+O_WON = 2
+
+def gameResult(record: GameRecord) -> int:
+    """Find the result of a logged game by replaying it.
+
+    Returns: TIE, X_WON, or O_WON.
+    """
+    playerBoard = replayGame(record)
+
+    if playerBoard.isWinner("X"):
+        return X_WON if playerBoard.numWins else O_WON
+
+    return TIE
+
+def buildArchive(logDirectory: str = DEFAULT_LOG_DIRECTORY, archivePath: str = DEFAULT_ARCHIVE_PATH) -> int:
+    """Write every game of a game log to an archive of fixed-size records, and its index of games by player.
+
+    Game ids are the 1-based positions of the games in the log, the same numbers that gamelog.py lists. The
+    archive and index are written to temporary files and renamed into place, so readers never see half of one.
+
+    logDirectory: The directory of the game log segments.
+    archivePath: File path of the archive. The index is written to archivePath + INDEX_SUFFIX.
+
+    Returns: The number of games archived.
+    """
+    records = list(readGames(logDirectory))
+    nameSize = max((len(name.encode()) for record in records for name in (record.xName, record.oName)), default=0)
+    movesSize = max((len(packMoves(record.moves, record.boardSize)) for record in records), default=0)
+    playerGames = {}
+
+    with open(archivePath + ".tmp", "wb") as archive:
+        archive.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, nameSize, movesSize))
+
+        for gameId, record in enumerate(records, 1):
+            archive.write(RECORD_FIELDS.pack(record.boardSize, record.winLength, record.startPlayer, len(record.moves), gameResult(record)))
+            archive.write(record.xName.encode().ljust(nameSize, b"\0"))
+            archive.write(record.oName.encode().ljust(nameSize, b"\0"))
+            archive.write(packMoves(record.moves, record.boardSize).ljust(movesSize, b"\0"))
+
+            playerGames.setdefault(record.xName, []).append(gameId)
+            if record.oName != record.xName:
+                playerGames.setdefault(record.oName, []).append(gameId)
+
+    # sorted the same way as the padded names compared by GameArchive.getPlayerGames
+    userNames = sorted(playerGames, key=lambda userName: userName.encode().ljust(nameSize, b"\0"))
+
+    with open(archivePath + INDEX_SUFFIX + ".tmp", "wb") as index:
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, len(userNames)))
+        firstGame = 0
+
+        for userName in userNames:
+            index.write(userName.encode().ljust(nameSize, b"\0") + PLAYER_FIELDS.pack(firstGame, len(playerGames[userName])))
+            firstGame += len(playerGames[userName])
+
+        for userName in userNames:
+            index.write(b"".join(GAME_ID.pack(gameId) for gameId in playerGames[userName]))
+
+    os.replace(archivePath + ".tmp", archivePath)
+    os.replace(archivePath + INDEX_SUFFIX + ".tmp", archivePath + INDEX_SUFFIX)
+    return len(records)
+
+class GameArchive:
+    """A class that reads games from an archive by seeking straight to their records.
+
+    The archive is memory mapped, and a game id is turned into its record's offset with one multiplication,
+    so reading a game touches only that record's bytes however large the archive is. The fields of a record
+    are read through memoryview slices of the map, without copying the record. The index is memory mapped
+    too, and a player's entry is found by a binary search of its sorted fixed-size entries, so opening the
+    archive reads nothing but the two headers, and a player's games are found without scanning either file.
+
+    Attributes:
+        archiveFile (BufferedReader): The open archive file.
+        archiveMap (mmap): Read-only memory map of the archive.
+        archiveView (memoryview): memoryview of archiveMap that records are sliced from.
+        nameSize (int): The size in bytes of every user name field.
+        movesSize (int): The size in bytes of every move field.
+        recordSize (int): The size in bytes of every record.
+        numGames (int): The number of games in the archive.
+        indexFile (BufferedReader): The open index file.
+        indexMap (mmap): Read-only memory map of the index.
+        indexView (memoryview): memoryview of indexMap that player entries and game ids are read from.
+        numPlayers (int): The number of players in the index.
+        entrySize (int): The size in bytes of every player entry.
+        gameIdsStart (int): The offset in the index of the first game id.
+    """
+
+    def __init__(self, archivePath: str = DEFAULT_ARCHIVE_PATH):
+        self.indexFile = None
+        self.archiveFile = open(archivePath, "rb")
+        self.archiveMap = mmap.mmap(self.archiveFile.fileno(), 0, access=mmap.ACCESS_READ)
+        self.archiveView = memoryview(self.archiveMap)
+
+        magic, self.nameSize, self.movesSize = ARCHIVE_HEADER.unpack_from(self.archiveView)
+        if magic != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f"{archivePath} is not a game archive.")
+
+        self.recordSize = RECORD_FIELDS.size + 2 * self.nameSize + self.movesSize
+        self.numGames = (len(self.archiveMap) - ARCHIVE_HEADER.size) // self.recordSize
+
+        self.indexFile = open(archivePath + INDEX_SUFFIX, "rb")
+        self.indexMap = mmap.mmap(self.indexFile.fileno(), 0, access=mmap.ACCESS_READ)
+        self.indexView = memoryview(self.indexMap)
+
+        magic, self.numPlayers = INDEX_HEADER.unpack_from(self.indexView)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{archivePath + INDEX_SUFFIX} is not a game archive index.")
+
+        self.entrySize = self.nameSize + PLAYER_FIELDS.size
+        self.gameIdsStart = INDEX_HEADER.size + self.numPlayers * self.entrySize
+
+    def getNumGames(self) -> int:
+        """Get the number of games in the archive.
+
+        Returns: The number of games.
+        """
+        return self.numGames
+
+    def getRecordView(self, gameId: int) -> memoryview:
+        """Get the record of a game without copying it.
+
+        gameId: The id (1 - numGames) of the game.
+
+        Returns: memoryview slice of the archive map holding the game's record.
+        """
+        if not 1 <= gameId <= self.numGames:
+            raise IndexError(f"There is no game {gameId} in the archive.")
+
+        recordStart = ARCHIVE_HEADER.size + (gameId - 1) * self.recordSize
+        return self.archiveView[recordStart:recordStart + self.recordSize]
+
+    def getResult(self, gameId: int) -> int:
+        """Get the result of a game, read from its record's result byte.
+
+        Returns: TIE, X_WON, or O_WON.
+        """
+        return self.getRecordView(gameId)[RECORD_FIELDS.size - 1]
+
+    def getGame(self, gameId: int) -> GameRecord:
+        """Read a game from its record.
+
+        gameId: The id (1 - numGames) of the game.
+
+        Returns: GameRecord type object of the game.
+        """
+        recordView = self.getRecordView(gameId)
+        boardSize, winLength, startPlayer, numMoves, result = RECORD_FIELDS.unpack_from(recordView)
+        oNameStart = RECORD_FIELDS.size + self.nameSize
+        movesStart = oNameStart + self.nameSize
+
+        xName = bytes(recordView[RECORD_FIELDS.size:oNameStart]).rstrip(b"\0").decode()
+        oName = bytes(recordView[oNameStart:movesStart]).rstrip(b"\0").decode()
+        moves = unpackMoves(recordView[movesStart:], numMoves, boardSize)
+        return GameRecord(xName, oName, startPlayer, boardSize, winLength, moves)
+
+    def getPlayerGames(self, userName: str) -> list[int]:
+        """Look up the games of a player in the index.
+
+        userName: The user name of the player.
+
+        Returns: The ids of the player's games, in order.
+        """
+        paddedName = userName.encode().ljust(self.nameSize, b"\0")
+        low, high = 0, self.numPlayers
+
+        # binary search for the first entry whose name is not before paddedName
+        while low < high:
+            middle = (low + high) // 2
+            entryStart = INDEX_HEADER.size + middle * self.entrySize
+
+            if bytes(self.indexView[entryStart:entryStart + self.nameSize]) < paddedName:
+                low = middle + 1
+            else:
+                high = middle
+
+        entryStart = INDEX_HEADER.size + low * self.entrySize
+
+        if low == self.numPlayers or self.indexView[entryStart:entryStart + self.nameSize] != paddedName:
+            return []
+
+        firstGame, numGames = PLAYER_FIELDS.unpack_from(self.indexView, entryStart + self.nameSize)
+        return list(struct.unpack_from(f"<{numGames}I", self.indexView, self.gameIdsStart + firstGame * GAME_ID.size))
+
+    def playerStats(self, userName: str) -> tuple[int, int, int, int]:
+        """Count the results of a player's games, reading only the records of those games.
+
+        userName: The user name of the player.
+
+        Returns: A tuple of numWins, numTies, numLosses, and numGames, the same order as StatsStore.loadStats.
+        """
+        paddedName = userName.encode().ljust(self.nameSize, b"\0")
+        numWins = numTies = numLosses = 0
+
+        for gameId in self.getPlayerGames(userName):
+            recordView = self.getRecordView(gameId)
+            result = recordView[RECORD_FIELDS.size - 1]
+            # the X name is compared in place, without copying it out of the map
+            playerWon = X_WON if recordView[RECORD_FIELDS.size:RECORD_FIELDS.size + self.nameSize] == paddedName else O_WON
+
+            if result == TIE:
+                numTies += 1
+            elif result == playerWon:
+                numWins += 1
+            else:
+                numLosses += 1
+
+        return numWins, numTies, numLosses, numWins + numTies + numLosses
+
+    def close(self) -> None:
+        """Release the memory maps and close the archive and index files.
+        """
+        self.archiveView.release()
+        self.archiveMap.close()
+        self.archiveFile.close()
+
+        if self.indexFile is not None:
+            self.indexView.release()
+            self.indexMap.close()
+            self.indexFile.close()
+
+def main() -> None:
+    """Main function for running the program.
+
+    Builds the archive from the game log, replays one archived game, or prints the stats and games of a player.
+    """
+    parser = argparse.ArgumentParser(description="Build and read a memory-mapped archive of logged games.")
+    parser.add_argument("-a", "--archive", default=DEFAULT_ARCHIVE_PATH, help="file path of the archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    buildParser = commands.add_parser("build", help="archive every game of the game log")
+    buildParser.add_argument("-d", "--directory", default=DEFAULT_LOG_DIRECTORY, help="directory of the log segments")
+    replayParser = commands.add_parser("replay", help="replay one archived game move by move")
+    replayParser.add_argument("game", type=int, help="id of the game, as listed by gamelog.py")
+    playerParser = commands.add_parser("player", help="print the stats and game ids of a player")
+    playerParser.add_argument("userName", help="user name of the player")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Archived {buildArchive(args.directory, args.archive)} games.")
+        return
+
+    gameArchive = GameArchive(args.archive)
+
+    if args.command == "replay":
+        try:
+            record = gameArchive.getGame(args.game)
+            print(f"{record.xName} (X) vs {record.oName} (O), {'X' if record.startPlayer == X_STARTS else 'O'} moves first.")
+            replayGame(record, TextRenderer())
+        except IndexError as error:
+            print(error)
+    else:
+        numWins, numTies, numLosses, numGames = gameArchive.playerStats(args.userName)
+        print(f"{args.userName}: {numWins} wins, {numLosses} losses, {numTies} ties in {numGames} games")
+        print(f"Games: {' '.join(str(gameId) for gameId in gameArchive.getPlayerGames(args.userName))}")
+
+    gameArchive.close()
+
+
+if __name__ == "__main__":
+    main()
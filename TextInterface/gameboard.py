@@ -1,11 +1,75 @@
+from functools import lru_cache
+import random
+
 class InvalidMove(Exception):
-    """Custom exception made to classify a move that cannot be made (tile space already with a letter).
+    """Custom exception made to classify a move that cannot be made (tile space already with a letter, or off the board).
     """
     pass
 
+# The (row, column) steps for the 4 line directions: horizontal, vertical, and both diagonals.
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+# Cell values of the game board bytearray, the same as the flat lists used by minimax.py.
+EMPTY = 0
+X_PIECE = 1
+O_PIECE = 2
+# Maps a cell value to its letter, and a letter to its cell value.
+PIECE_LETTERS = ("", "X", "O")
+PIECE_VALUES = {"": EMPTY, "X": X_PIECE, "O": O_PIECE}
+# Seed of the Zobrist keys, fixed so that a position has the same key in every process.
+ZOBRIST_SEED = 0x5A0B7157
+# Zobrist key of an empty board.
+EMPTY_BOARD_KEY = 0
+
+@lru_cache(maxsize=None)
+def emptyBoard(numTiles: int) -> bytes:
+    """Get an empty board of numTiles cells, shared by every game board of that size.
+
+    Returns: numTiles EMPTY bytes, copied over a game board to clear it without building a new board.
+    """
+    return bytes(numTiles)
+
+@lru_cache(maxsize=None)
+def tileLines(boardSize: int, winLength: int) -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """Get the winning lines through each tile of a board, shared by every game board of that size and win length.
+
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same game piece that must be aligned to win.
+
+    Returns: A tuple with, for each board index (tile - 1), a tuple of every run of winLength tiles through it,
+    each run holding the board indexes of its other winLength - 1 tiles.
+    """
+    lines = [[] for index in range(boardSize * boardSize)]
+
+    for row in range(boardSize):
+        for col in range(boardSize):
+            for rowStep, colStep in LINE_DIRECTIONS:
+                endRow = row + rowStep * (winLength - 1)
+                endCol = col + colStep * (winLength - 1)
+
+                if 0 <= endRow < boardSize and 0 <= endCol < boardSize:
+                    run = [(row + rowStep * step) * boardSize + col + colStep * step for step in range(winLength)]
+
+                    for index in run:
+                        lines[index].append(tuple(other for other in run if other != index))
+
+    return tuple(tuple(tileRuns) for tileRuns in lines)
+
+@lru_cache(maxsize=None)
+def zobristKeys(numTiles: int) -> tuple[tuple[int, int, int], ...]:
+    """Get the random 64-bit Zobrist keys of the tiles of a board of numTiles cells, shared by every game board of that size.
+
+    Returns: A tuple with a (0, X key, O key) tuple for each board index (tile - 1), indexed by cell value, so the key of
+    a position is the XOR of the keys of its pieces, and placing a piece changes the key with one XOR.
+    """
+    rng = random.Random(ZOBRIST_SEED + numTiles)
+    return tuple((0, rng.getrandbits(64), rng.getrandbits(64)) for index in range(numTiles))
+
 class BoardClass:
     """A class that stores and handles information of the gameboard, stats, and players.
 
+    The attributes are kept in __slots__ and the board in one bytearray, so a server holding many live
+    game boards stores each in a small fixed block instead of a dict plus a list per row.
+
     Attributes:
         playerName (str): The user name of the player with this game board. (Required parameter)
         otherPlayer (str): The user name of the other tic-tac-toe player.
@@ -14,11 +78,23 @@ class BoardClass:
         numTies (int): The total number of ties for this player.
         numLosses (int): The total number of losses for this player.
         numGames (int): The total number of games played.
-        gameBoard (list[list[str, str, str], list[str, str, str], list[str, str, str]]): 3x3 grid of lists to represent the game board.
+        gameBoard (bytearray): boardSize squared cells in tile order, EMPTY, X_PIECE, or O_PIECE for each tile.
+        boardSize (int): The number of rows and columns on the game board, 3 for standard tic-tac-toe.
+        winLength (int): The number of the same game piece that must be aligned to win, 3 for standard tic-tac-toe.
+        lastTile (int): The tile (1 - boardSize squared) of the last move placed on the game board, 0 if no move has been made this game.
+        numMoves (int): The number of moves placed on the game board this game.
+        moveHistory (bytearray): The tiles of this game's moves, in the order they were played.
+        zobristKey (int): 64-bit Zobrist key of the position, the XOR of the zobristTable keys of every piece on the board.
+        zobristTable (tuple[tuple[int, int, int], ...]): The zobristKeys of this board size.
+        lineTable (tuple[tuple[tuple[int, ...], ...], ...]): The tileLines of this board size and win length.
     """
 
+    __slots__ = ("playerName", "otherPlayer", "lastPlayer", "numWins", "numTies", "numLosses", "numGames",
+                 "gameBoard", "boardSize", "winLength", "lastTile", "numMoves", "moveHistory",
+                 "zobristKey", "zobristTable", "lineTable")
+
     def __init__(self, playerName: str, otherPlayer: str = "", lastPlayer: str = "", numWins: int = 0, numTies: int = 0, numLosses: int = 0, numGames: int = 0,
-                 gameBoard: list[list[str, str, str], list[str, str, str], list[str, str, str]] = [["", "", ""], ["", "", ""], ["", "", ""]]):
+                 gameBoard: list[list[str]] = None, boardSize: int = 3, winLength: int = 3):
         self.playerName = playerName
         self.otherPlayer = otherPlayer
         self.lastPlayer = lastPlayer
@@ -26,7 +102,24 @@ class BoardClass:
         self.numTies = numTies
         self.numLosses = numLosses
         self.numGames = numGames
-        self.gameBoard = gameBoard
+        # every game board gets its own cells, copied from any passed in grid of letters
+        self.gameBoard = bytearray(boardSize * boardSize)
+        if gameBoard is not None:
+            for tile, letter in enumerate((letter for row in gameBoard for letter in row), 1):
+                self.gameBoard[tile - 1] = PIECE_VALUES[letter]
+
+        self.boardSize = boardSize
+        self.winLength = winLength
+        self.lastTile = 0
+        self.numMoves = len(self.gameBoard) - self.gameBoard.count(EMPTY)
+        # the order of any pieces on a passed in game board is unknown, so only moves made from here on are recorded
+        self.moveHistory = bytearray()
+        self.zobristTable = zobristKeys(boardSize * boardSize)
+        self.lineTable = tileLines(boardSize, winLength)
+        self.zobristKey = EMPTY_BOARD_KEY
+
+        for index, piece in enumerate(self.gameBoard):
+            self.zobristKey ^= self.zobristTable[index][piece]
 
     def getPlayerName(self) -> str:
         """Get the user name of the player with this game board.
@@ -56,6 +149,86 @@ class BoardClass:
         userName: String representing the username of the last player to have a turn.
         """
         self.lastPlayer = userName
+
+    def setStats(self, numWins: int, numTies: int, numLosses: int, numGames: int) -> None:
+        """Set the win, tie, loss, and game totals, such as stats loaded from a StatsStore.
+
+        numWins: The total number of wins for this player.
+        numTies: The total number of ties for this player.
+        numLosses: The total number of losses for this player.
+        numGames: The total number of games played.
+        """
+        self.numWins = numWins
+        self.numTies = numTies
+        self.numLosses = numLosses
+        self.numGames = numGames
+
+    def getBoardSize(self) -> int:
+        """Get the number of rows and columns on the game board.
+
+        Returns: The integer board size, 3 for standard tic-tac-toe.
+        """
+        return self.boardSize
+
+    def getWinLength(self) -> int:
+        """Get the number of the same game piece that must be aligned to win.
+
+        Returns: The integer win length, 3 for standard tic-tac-toe.
+        """
+        return self.winLength
+
+    def setBoardSize(self, boardSize: int, winLength: int) -> None:
+        """Set the board size and win length, replacing the game board with an empty board of the new size.
+
+        boardSize: The number of rows and columns on the game board.
+        winLength: The number of the same game piece that must be aligned to win.
+        """
+        self.boardSize = boardSize
+        self.winLength = winLength
+        self.gameBoard = bytearray(boardSize * boardSize)
+        self.zobristTable = zobristKeys(boardSize * boardSize)
+        self.lineTable = tileLines(boardSize, winLength)
+        self.lastTile = 0
+        self.numMoves = 0
+        self.moveHistory.clear()
+        self.zobristKey = EMPTY_BOARD_KEY
+
+    def getLastTile(self) -> int:
+        """Get the tile of the last move placed on the game board.
+
+        Returns: An integer ranging from 1 to boardSize squared, or 0 if no move has been made this game.
+        """
+        return self.lastTile
+
+    def getZobristKey(self) -> int:
+        """Get the Zobrist key of the current position, kept up to date by updateGameBoard and resetGameBoard.
+
+        Returns: A 64-bit integer key, the same for the same position on any game board of the same size.
+        """
+        return self.zobristKey
+
+    def getMoveHistory(self) -> bytes:
+        """Get the tiles of this game's moves, such as for recording the game in a GameLog.
+
+        Returns: The tiles (1 - boardSize squared) of the moves, in the order they were played.
+        """
+        return bytes(self.moveHistory)
+
+    def getGameBoardTile(self, tile: int) -> str:
+        """Get the current string value of a certain tile from the gameboard.
+
+        tile: An integer ranging from 1 to boardSize squared that denotes the tiles on the gameboard
+
+        Returns: The string value of the corresponding gameboard tile
+        """
+        return PIECE_LETTERS[self.gameBoard[tile - 1]]
+
+    def getCells(self) -> bytearray:
+        """Get a copy of the game board's cells, such as for a search to place and remove pieces on.
+
+        Returns: A bytearray of boardSize squared cells in tile order, EMPTY, X_PIECE, or O_PIECE for each tile.
+        """
+        return bytearray(self.gameBoard)
         
 
     def updateGamesPlayed(self) -> None:
@@ -64,73 +237,63 @@ class BoardClass:
         self.numGames += 1
 
     def resetGameBoard(self) -> None:
-        """Reset the game board by replacing all parts of the grid with empty strings.
+        """Reset the game board by clearing every cell in place, with one copy of a shared empty board.
         """
-        for i in range(3):
-            for j in range(3):
-                self.gameBoard[i][j] = ""
+        self.gameBoard[:] = emptyBoard(len(self.gameBoard))
+
+        self.lastTile = 0
+        self.numMoves = 0
+        self.moveHistory.clear()
+        self.zobristKey = EMPTY_BOARD_KEY
             
     def updateGameBoard(self, tile: int, gameLetter: str) -> None:
-        """Replace specified board tile (1 - 9) with an X if player 1, O if player 2.
+        """Replace specified board tile (1 - boardSize squared) with an X if player 1, O if player 2.
 
-        Tile: Integer ranging from 1 - 9 that specifies a tic-tac-toe tile from top-left to bottom-right.
+        Tile: Integer ranging from 1 - boardSize squared that specifies a tile from top-left to bottom-right.
         gameLetter: Either X or O to represent what letter should be placed on the board.
         """
-        if 1 <= tile <= 3:
-            # first row of board
-            if self.gameBoard[0][tile - 1] == "":
-                self.gameBoard[0][tile - 1] = gameLetter
-            else:
-                raise InvalidMove
-        elif 4 <= tile <= 6:
-            # second row of board
-            if self.gameBoard[1][tile - 4] == "":
-                self.gameBoard[1][tile - 4] = gameLetter
-            else:
-                raise InvalidMove
-        else:
-            # third row of board
-            if self.gameBoard[2][tile - 7] == "":
-                self.gameBoard[2][tile - 7] = gameLetter
-            else:
-                raise InvalidMove
+        # a tile of 0 would index the last cell instead of failing, so the range is checked before the cell
+        if not 1 <= tile <= len(self.gameBoard) or self.gameBoard[tile - 1] != EMPTY:
+            raise InvalidMove
+
+        piece = PIECE_VALUES[gameLetter]
+        self.gameBoard[tile - 1] = piece
+        self.zobristKey ^= self.zobristTable[tile - 1][piece]
+
+        self.lastTile = tile
+        self.numMoves += 1
+        self.moveHistory.append(tile)
 
     def isWinner(self, playerLetter: str) -> bool:
-        """Check the board if a win, with 3 of the same game piece aligned, has occurred.
+        """Check the lines through the last placed tile for a win, with winLength of the same game piece aligned.
 
         playerLetter: The letter that the player is using to play, either X or O.
 
         If win has occurred, adds 1 to wins if this player won, adds 1 to losses if the other player won.
         Returns true or false regarding if a player did indeed win.
         """
+        if self.lastTile == 0:
+            # no moves have been made this game, so there is no winner yet
+            return False
+
+        gameBoard = self.gameBoard
+        piece = gameBoard[self.lastTile - 1]
         playerWon = False
-        
-        for i in range(3):
-            if (self.gameBoard[i][0] != "") and (self.gameBoard[i][0] == self.gameBoard[i][1]) and (self.gameBoard[i][1] == self.gameBoard[i][2]):
-                # checks for the same 3 letters on the rows
-                playerWon = True
-                letter = self.gameBoard[i][0]
-            elif (self.gameBoard[0][i] != "") and (self.gameBoard[0][i] == self.gameBoard[1][i]) and (self.gameBoard[1][i] == self.gameBoard[2][i]):
-                # checks for the same 3 letters on the columns
-                playerWon = True
-                letter = self.gameBoard[0][i]
 
-        if (self.gameBoard[0][0] != "") and (self.gameBoard[0][0] == self.gameBoard[1][1]) and (self.gameBoard[1][1] == self.gameBoard[2][2]):
-                # checks for the same 3 letters on the top left to bottom right diagonal
-                playerWon = True
-                letter = self.gameBoard[1][1]
-        elif (self.gameBoard[2][0] != "") and (self.gameBoard[2][0] == self.gameBoard[1][1]) and (self.gameBoard[1][1] == self.gameBoard[0][2]):
-                # checks for the same 3 letters on the bottom left to top right diagonal
+        # only the precomputed lines through the last placed tile can have been completed by the last move
+        for line in self.lineTable[self.lastTile - 1]:
+            for index in line:
+                if gameBoard[index] != piece:
+                    break
+            else:
                 playerWon = True
-                letter = self.gameBoard[1][1]
+                break
 
         if playerWon:
-            if playerLetter == letter:
+            if PIECE_VALUES[playerLetter] == piece:
                 self.numWins += 1
-                print("You won!")
             else:
                 self.numLosses += 1
-                print("You lost...")
 
             self.updateGamesPlayed()
 
@@ -142,45 +305,171 @@ class BoardClass:
         If this is true, updates total number of ties.
         Returns true or false if the board is indeed filled up.
         """
-        isFull = True
+        # every tile holds a piece once the move counter reaches the number of tiles
+        isFull = self.numMoves == self.boardSize * self.boardSize
 
-        # if there are any empty spaces, the board is deemed not full
-        for row in self.gameBoard:
-            for space in row:
-                if space == "":
-                    isFull = False
         if isFull:
             self.numTies += 1
             self.updateGamesPlayed()
-            print("Tie!")
 
         return isFull
 
-    def printStats(self) -> None:
-        """Print out each of this game board's attributes on a newline.
-        """
-        print("Player's user name:", self.playerName)
-        print("Last player to make a move:", self.lastPlayer)
-        print("Number of games played:", self.numGames)
-        print("Number of wins:", self.numWins)
-        print("Number of losses:", self.numLosses)
-        print("Number of ties:", self.numTies)
-
-    def printBoard(self) -> None:
-        """Print out a formatted 3x3 visual grid of the game board.
-        """
-        print(f'\n{self.gameBoard[0][0]:^3}|{self.gameBoard[0][1]:^3}|{self.gameBoard[0][2]:^3}')
-        print('-' * 11)
-        print(f'{self.gameBoard[1][0]:^3}|{self.gameBoard[1][1]:^3}|{self.gameBoard[1][2]:^3}')
-        print('-' * 11)
-        print(f'{self.gameBoard[2][0]:^3}|{self.gameBoard[2][1]:^3}|{self.gameBoard[2][2]:^3}\n')
-
-    def printInstructions(self) -> None:
-        """Print out instructions for what numbers (1-9) correspond to which tile on the gameboard, using a 3x3 grid.
-        """
-        print("Moves are made with an integer from 1-9, following the format of the grid below.")
-        print(f'{1:^3}|{2:^3}|{3:^3}')
-        print('-' * 11)
-        print(f'{4:^3}|{5:^3}|{6:^3}')
-        print('-' * 11)
-        print(f'{7:^3}|{8:^3}|{9:^3}\n')
+
+# Bit masks of the 8 winning lines, where bit (tile - 1) represents a tile of the 3x3 board.
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100                # diagonals
+)
+# Maps each tile (1 - 9) to only the winning line masks that pass through it.
+TILE_MASKS = {tile: tuple(mask for mask in WIN_MASKS if mask & (1 << (tile - 1))) for tile in range(1, 10)}
+
+class BitBoardClass(BoardClass):
+    """An alternate BoardClass engine that stores the X and O pieces as two 9-bit integers.
+
+    Winning lines are checked against the precomputed WIN_MASKS instead of scanning the board strings,
+    which keeps isWinner and boardIsFull cheap for self-play and analysis jobs. The gameBoard attribute is
+    only read once to load any starting pieces; all later reads and writes go through the bits. Only the
+    standard 3x3 board with 3 in a row is supported.
+
+    Attributes:
+        xBits (int): 9-bit integer with a bit set for every tile holding an X.
+        oBits (int): 9-bit integer with a bit set for every tile holding an O.
+    """
+
+    __slots__ = ("xBits", "oBits")
+
+    def __init__(self, playerName: str, otherPlayer: str = "", lastPlayer: str = "", numWins: int = 0, numTies: int = 0, numLosses: int = 0, numGames: int = 0,
+                 gameBoard: list[list[str, str, str], list[str, str, str], list[str, str, str]] = None):
+        super().__init__(playerName, otherPlayer, lastPlayer, numWins, numTies, numLosses, numGames, gameBoard)
+        self.xBits = 0
+        self.oBits = 0
+
+        # loads any pieces already placed on the passed in game board
+        for index in range(9):
+            if self.gameBoard[index] == X_PIECE:
+                self.xBits |= 1 << index
+            elif self.gameBoard[index] == O_PIECE:
+                self.oBits |= 1 << index
+
+        self.numMoves = bin(self.xBits | self.oBits).count("1")
+
+    def getGameBoardTile(self, tile: int) -> str:
+        """Get the current string value of a certain tile from the bitboards.
+
+        tile: An integer ranging from 1-9 that denotes the tiles on the gameboard
+
+        Returns: "X", "O", or an empty string if the tile has not been played.
+        """
+        tileBit = 1 << (tile - 1)
+
+        if self.xBits & tileBit:
+            return "X"
+        elif self.oBits & tileBit:
+            return "O"
+        return ""
+
+    def getCells(self) -> bytearray:
+        """Get the game board's cells, built from the bitboards, as the gameBoard attribute is not kept up to date.
+
+        Returns: A bytearray of 9 cells in tile order, EMPTY, X_PIECE, or O_PIECE for each tile.
+        """
+        cells = bytearray(9)
+
+        for index in range(9):
+            if self.xBits >> index & 1:
+                cells[index] = X_PIECE
+            elif self.oBits >> index & 1:
+                cells[index] = O_PIECE
+
+        return cells
+
+    def setBoardSize(self, boardSize: int, winLength: int) -> None:
+        """Replace the game board with an empty board, which must be the standard 3x3 board with 3 in a row.
+
+        boardSize: The number of rows and columns on the game board, only 3 is supported.
+        winLength: The number of the same game piece that must be aligned to win, only 3 is supported.
+
+        Raises ValueError for any other board size or win length, as WIN_MASKS and TILE_MASKS only cover the 3x3 board.
+        """
+        if boardSize != 3 or winLength != 3:
+            raise ValueError("BitBoardClass only supports the 3x3 board with a win length of 3.")
+
+        self.resetGameBoard()
+
+    def resetGameBoard(self) -> None:
+        """Reset the game board by clearing both bitboards.
+        """
+        self.xBits = 0
+        self.oBits = 0
+        self.lastTile = 0
+        self.numMoves = 0
+        self.moveHistory.clear()
+        self.zobristKey = EMPTY_BOARD_KEY
+
+    def updateGameBoard(self, tile: int, gameLetter: str) -> None:
+        """Set the bit for the specified board tile (1 - 9) on the X bitboard if player 1, O bitboard if player 2.
+
+        Tile: Integer ranging from 1 - 9 that specifies a tic-tac-toe tile from top-left to bottom-right.
+        gameLetter: Either X or O to represent what letter should be placed on the board.
+        """
+        if not 1 <= tile <= 9:
+            raise InvalidMove
+
+        tileBit = 1 << (tile - 1)
+
+        if (self.xBits | self.oBits) & tileBit:
+            raise InvalidMove
+
+        if gameLetter == "X":
+            self.xBits |= tileBit
+        else:
+            self.oBits |= tileBit
+
+        self.zobristKey ^= self.zobristTable[tile - 1][PIECE_VALUES[gameLetter]]
+
+        self.lastTile = tile
+        self.numMoves += 1
+        self.moveHistory.append(tile)
+
+    def isWinner(self, playerLetter: str) -> bool:
+        """Check the bitboards for a win, with 3 of the same game piece aligned on a WIN_MASKS line through the last tile.
+
+        playerLetter: The letter that the player is using to play, either X or O.
+
+        If win has occurred, adds 1 to wins if this player won, adds 1 to losses if the other player won.
+        Returns true or false regarding if a player did indeed win.
+        """
+        if self.lastTile == 0:
+            return False
+
+        letter = self.getGameBoardTile(self.lastTile)
+        letterBits = self.xBits if letter == "X" else self.oBits
+
+        # only the masks through the last placed tile can have been completed by the last move
+        for mask in TILE_MASKS[self.lastTile]:
+            if letterBits & mask == mask:
+                break
+        else:
+            return False
+
+        if playerLetter == letter:
+            self.numWins += 1
+        else:
+            self.numLosses += 1
+
+        self.updateGamesPlayed()
+        return True
+
+    def boardIsFull(self) -> bool:
+        """Check if the move counter has reached every tile, with no possible moves to be made.
+
+        If this is true, updates total number of ties.
+        Returns true or false if the board is indeed filled up.
+        """
+        if self.numMoves != 9:
+            return False
+
+        self.numTies += 1
+        self.updateGamesPlayed()
+        return True
@@ -0,0 +1,302 @@
+from gameboard import BoardClass
+from renderer import TextRenderer
+import argparse
+import glob
+import os
+import struct
+import threading
+import zlib
+
+# Default directory of the log segments, next to this file.
+DEFAULT_LOG_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gamelogs")
+# A new segment file is started once the current one reaches this many bytes.
+SEGMENT_SIZE = 4 * 1024 * 1024
+SEGMENT_PATTERN = "games-{:06d}.log"
+# Written records are flushed to disk once this many are waiting, or at most this many seconds after the first of them was written.
+SYNC_RECORDS = 256
+SYNC_SECONDS = 1.0
+
+# Every record starts with its length (not counting the length field), board size, win length, start player,
+# number of moves, and the UTF-8 lengths of the X and O user names, in little endian byte order.
+RECORD_HEADER = struct.Struct("<HBBBBBB")
+# Every record ends with the CRC-32 of everything after the length field, so a torn write at the end of a crash is detected.
+RECORD_CHECKSUM = struct.Struct("<I")
+# Value of the start player byte for the letter that moved first.
+X_STARTS = 0
+O_STARTS = 1
+
+def packMoves(moves: bytes, boardSize: int) -> bytes:
+    """Pack the tiles of a game's moves, two tile indexes (tile - 1) to a byte, low 4 bits first.
+
+    Boards with more than 16 tiles do not fit a tile index in 4 bits, so their moves are kept at one byte each.
+
+    moves: The tiles (1 - boardSize squared) of the moves, in the order they were played.
+    boardSize: The number of rows and columns on the board.
+
+    Returns: The packed moves.
+    """
+    if boardSize * boardSize > 16:
+        return bytes(moves)
+
+    packed = bytearray((len(moves) + 1) // 2)
+
+    for index, tile in enumerate(moves):
+        packed[index // 2] |= (tile - 1) << (4 * (index % 2))
+
+    return bytes(packed)
+
+def unpackMoves(packed: bytes, numMoves: int, boardSize: int) -> list[int]:
+    """Unpack moves packed by packMoves.
+
+    Returns: The tiles (1 - boardSize squared) of the moves, in the order they were played.
+    """
+    if boardSize * boardSize > 16:
+        return list(packed[:numMoves])
+
+    return [((packed[index // 2] >> (4 * (index % 2))) & 0xF) + 1 for index in range(numMoves)]
+
+def encodeRecord(xName: str, oName: str, moves: bytes, boardSize: int, winLength: int, startPlayer: int = X_STARTS) -> bytes:
+    """Build the log record of one game.
+
+    xName: The user name of the player playing X.
+    oName: The user name of the player playing O.
+    moves: The tiles (1 - boardSize squared) of the moves, in the order they were played.
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same game piece that must be aligned to win.
+    startPlayer: X_STARTS or O_STARTS, for the letter that moved first.
+
+    Returns: The record bytes, ready to be appended to a segment.
+    """
+    xNameBytes = xName.encode()
+    oNameBytes = oName.encode()
+    packedMoves = packMoves(moves, boardSize)
+    recordSize = RECORD_HEADER.size - 2 + len(xNameBytes) + len(oNameBytes) + len(packedMoves) + RECORD_CHECKSUM.size
+
+    body = RECORD_HEADER.pack(recordSize, boardSize, winLength, startPlayer, len(moves), len(xNameBytes), len(oNameBytes))[2:]
+    body += xNameBytes + oNameBytes + packedMoves
+    return recordSize.to_bytes(2, "little") + body + RECORD_CHECKSUM.pack(zlib.crc32(body))
+
+class GameRecord:
+    """A class that holds one game read back from the log.
+
+    Attributes:
+        xName (str): The user name of the player playing X.
+        oName (str): The user name of the player playing O.
+        startPlayer (int): X_STARTS or O_STARTS, for the letter that moved first.
+        boardSize (int): The number of rows and columns on the board.
+        winLength (int): The number of the same game piece that must be aligned to win.
+        moves (list[int]): The tiles (1 - boardSize squared) of the moves, in the order they were played.
+    """
+
+    def __init__(self, xName: str, oName: str, startPlayer: int, boardSize: int, winLength: int, moves: list[int]):
+        self.xName = xName
+        self.oName = oName
+        self.startPlayer = startPlayer
+        self.boardSize = boardSize
+        self.winLength = winLength
+        self.moves = moves
+
+def decodeRecord(data: bytes, offset: int = 0) -> tuple[GameRecord, int]:
+    """Read the record that starts at offset.
+
+    data: The bytes of a segment, or any buffer holding records.
+    offset: The position of the record's length field in data.
+
+    Returns: A tuple of the GameRecord and the offset of the next record, or (None, offset) if the
+    record is cut short or its checksum does not match, as after a crash in the middle of a write.
+    """
+    if offset + RECORD_HEADER.size > len(data):
+        return None, offset
+
+    recordSize, boardSize, winLength, startPlayer, numMoves, xNameLength, oNameLength = RECORD_HEADER.unpack_from(data, offset)
+    recordEnd = offset + 2 + recordSize
+
+    if recordEnd > len(data):
+        return None, offset
+
+    checksumStart = recordEnd - RECORD_CHECKSUM.size
+    if zlib.crc32(data[offset + 2:checksumStart]) != RECORD_CHECKSUM.unpack_from(data, checksumStart)[0]:
+        return None, offset
+
+    nameStart = offset + RECORD_HEADER.size
+    movesStart = nameStart + xNameLength + oNameLength
+    xName = bytes(data[nameStart:nameStart + xNameLength]).decode()
+    oName = bytes(data[nameStart + xNameLength:movesStart]).decode()
+    moves = unpackMoves(data[movesStart:checksumStart], numMoves, boardSize)
+    return GameRecord(xName, oName, startPlayer, boardSize, winLength, moves), recordEnd
+
+def segmentPaths(directory: str = DEFAULT_LOG_DIRECTORY) -> list[str]:
+    """Find the log segments of a directory.
+
+    Returns: The segment file paths, oldest first.
+    """
+    return sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN.replace("{:06d}", "[0-9]" * 6))))
+
+class GameLog:
+    """A class that appends finished games to an append-only log split into segment files.
+
+    Records are written to a buffered file and only forced to disk once SYNC_RECORDS records are waiting, or
+    by a timer SYNC_SECONDS after the first unsynced record was written, so recording a game never waits on
+    the disk for each move or each game, even when no more games arrive. A crash can lose at most the games
+    of the last SYNC_SECONDS, and a record cut short is skipped on reading.
+
+    Attributes:
+        directory (str): The directory holding the segment files.
+        segmentSize (int): The size in bytes that starts a new segment.
+        segmentNumber (int): The number of the segment being appended to.
+        segmentFile (BufferedWriter): The open file of the segment being appended to.
+        unsyncedRecords (int): The number of records written since the last sync.
+        syncTimer (Timer): threading Timer type object that syncs the unsynced records, or None when all are synced.
+        lock (Lock): threading Lock type object held while writing or syncing, as the timer syncs from its own thread.
+    """
+
+    def __init__(self, directory: str = DEFAULT_LOG_DIRECTORY, segmentSize: int = SEGMENT_SIZE):
+        self.directory = directory
+        self.segmentSize = segmentSize
+        os.makedirs(directory, exist_ok=True)
+
+        existingSegments = segmentPaths(directory)
+        # appends to the newest segment, after any record that a crash cut short
+        self.segmentNumber = int(os.path.basename(existingSegments[-1])[6:12]) if existingSegments else 1
+        self.segmentFile = None
+        self.openSegment()
+        self.unsyncedRecords = 0
+        self.syncTimer = None
+        self.lock = threading.Lock()
+
+    def openSegment(self) -> None:
+        """Open the current segment for appending, cutting off a record left incomplete by a crash.
+        """
+        path = os.path.join(self.directory, SEGMENT_PATTERN.format(self.segmentNumber))
+
+        if os.path.exists(path):
+            with open(path, "rb") as segment:
+                data = segment.read()
+
+            offset = 0
+            while True:
+                record, nextOffset = decodeRecord(data, offset)
+                if record is None:
+                    break
+                offset = nextOffset
+
+            if offset != len(data):
+                os.truncate(path, offset)
+
+        self.segmentFile = open(path, "ab")
+
+    def appendGame(self, playerBoard: BoardClass, xName: str, oName: str, startPlayer: int = X_STARTS) -> None:
+        """Append the finished game on a game board to the log.
+
+        playerBoard: BoardClass type object holding the finished game, before resetGameBoard is run.
+        xName: The user name of the player playing X.
+        oName: The user name of the player playing O.
+        startPlayer: X_STARTS or O_STARTS, for the letter that moved first.
+        """
+        record = encodeRecord(xName, oName, playerBoard.getMoveHistory(), playerBoard.getBoardSize(), playerBoard.getWinLength(), startPlayer)
+
+        with self.lock:
+            if self.segmentFile.tell() >= self.segmentSize:
+                self.syncRecords()
+                self.segmentFile.close()
+                self.segmentNumber += 1
+                self.openSegment()
+
+            self.segmentFile.write(record)
+            self.unsyncedRecords += 1
+
+            if self.unsyncedRecords >= SYNC_RECORDS:
+                self.syncRecords()
+            elif self.syncTimer is None:
+                self.syncTimer = threading.Timer(SYNC_SECONDS, self.sync)
+                # a pending sync does not keep the program running, as close syncs any remaining records
+                self.syncTimer.daemon = True
+                self.syncTimer.start()
+
+    def sync(self) -> None:
+        """Force every written record to disk, from any thread.
+        """
+        with self.lock:
+            self.syncRecords()
+
+    def syncRecords(self) -> None:
+        """Force every written record to disk with one flush and fsync, and cancel the pending timer. The lock must be held.
+        """
+        if self.unsyncedRecords:
+            self.segmentFile.flush()
+            os.fsync(self.segmentFile.fileno())
+            self.unsyncedRecords = 0
+
+        if self.syncTimer is not None:
+            self.syncTimer.cancel()
+            self.syncTimer = None
+
+    def close(self) -> None:
+        """Sync any remaining records and close the current segment.
+        """
+        with self.lock:
+            self.syncRecords()
+            self.segmentFile.close()
+
+def readGames(directory: str = DEFAULT_LOG_DIRECTORY) -> iter:
+    """Read every game of the log, oldest first.
+
+    Returns: An iterator of GameRecord type objects.
+    """
+    for path in segmentPaths(directory):
+        with open(path, "rb") as segment:
+            data = segment.read()
+
+        offset = 0
+        while True:
+            record, offset = decodeRecord(data, offset)
+            if record is None:
+                break
+            yield record
+
+def replayGame(record: GameRecord, renderer: TextRenderer = None) -> BoardClass:
+    """Rebuild a logged game by playing its moves through BoardClass.updateGameBoard.
+
+    record: GameRecord type object of the game.
+    renderer: TextRenderer type object that shows the board after every move, or None to show nothing.
+
+    Returns: BoardClass type object from X's point of view, holding the final position of the game.
+    """
+    playerBoard = BoardClass(record.xName, otherPlayer=record.oName, boardSize=record.boardSize, winLength=record.winLength)
+    letter = "X" if record.startPlayer == X_STARTS else "O"
+
+    for tile in record.moves:
+        playerBoard.updateGameBoard(tile, letter)
+        playerBoard.setLastPlayer(record.xName if letter == "X" else record.oName)
+
+        if renderer is not None:
+            renderer.renderBoard(playerBoard, f"{playerBoard.lastPlayer} ({letter}) played tile {tile}.")
+
+        letter = "O" if letter == "X" else "X"
+
+    return playerBoard
+
+def main() -> None:
+    """Main function for running the program.
+
+    Lists the logged games, or replays one game move by move when its number is given.
+    """
+    parser = argparse.ArgumentParser(description="List or replay the games of a game log.")
+    parser.add_argument("game", type=int, nargs="?", help="number of the game to replay, as shown in the list")
+    parser.add_argument("-d", "--directory", default=DEFAULT_LOG_DIRECTORY, help="directory of the log segments")
+    args = parser.parse_args()
+
+    for gameNumber, record in enumerate(readGames(args.directory), 1):
+        if args.game is None:
+            print(f"{gameNumber}. {record.xName} (X) vs {record.oName} (O), {record.boardSize}x{record.boardSize}, "
+                  f"{len(record.moves)} moves: {' '.join(str(tile) for tile in record.moves)}")
+        elif gameNumber == args.game:
+            replayGame(record, TextRenderer())
+            return
+
+    if args.game is not None:
+        print(f"There is no game {args.game} in the log.")
+
+
+if __name__ == "__main__":
+    main()
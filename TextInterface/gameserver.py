@@ -0,0 +1,238 @@
+# SERVER (many player1 clients at once)
+from gameboard import InvalidMove
+from gameboard import BoardClass
+from gamelog import GameLog
+from minimax import MinimaxPlayer
+from evalcache import DEFAULT_CACHE_ENTRIES
+from protocol import ProtocolError
+from protocol import HELLO, MOVE, REMATCH, BYE, ACK, ERROR
+from protocol import encodeMessage, encodeHello, decodeHello, decodeMove, helloError, readMessage
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import os
+import signal
+
+# Seconds the computer may search each move, so a client on any board size gets each reply within about this
+# time, and its search worker is soon free for the next game's search.
+SEARCH_TIME = 0.5
+# Fewest search worker processes. Searches stop at a wall clock deadline, so extra workers on a machine with
+# few cores share the cores instead of making a quick 3x3 search wait behind a large board's search.
+MIN_SEARCH_WORKERS = 4
+
+# The computer player of a search worker process, set by startSearchWorker.
+workerPlayer = None
+
+def startSearchWorker(computerPlayer: MinimaxPlayer) -> None:
+    """Keep the computer player in a newly started search worker, so its transposition table lasts across the searches run there.
+
+    computerPlayer: MinimaxPlayer type object copied into the worker.
+    """
+    global workerPlayer
+    workerPlayer = computerPlayer
+    # a Ctrl-C stops the server, which then shuts the workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def workerSearch(moves: bytes, boardSize: int, winLength: int) -> tuple[int, int, tuple[int, int, int, int, float, int]]:
+    """Search player2's move in a worker process, rebuilding the game board there from its moves so only bytes are sent.
+
+    moves: The tiles of the game's moves in the order they were played, starting with player1's X.
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same piece that must be aligned to win.
+
+    Returns: A tuple of the chosen tile, the worker's process id, and the worker's cache stats (see workerCacheStats).
+    """
+    playerBoard = BoardClass("player2", boardSize=boardSize, winLength=winLength)
+
+    for moveNumber, tile in enumerate(moves):
+        playerBoard.updateGameBoard(tile, "X" if moveNumber % 2 == 0 else "O")
+
+    return workerPlayer.chooseMove(playerBoard, "O"), os.getpid(), workerCacheStats()
+
+def workerCacheStats() -> tuple[int, int, int, int, float, int]:
+    """Read the transposition table stats of the worker's computer player.
+
+    Returns: A tuple of the positions stored, the most positions kept, the hits, the misses, the hit rate, and the evictions.
+    """
+    table = workerPlayer.transpositionTable
+    return len(table), table.maxEntries, table.hits, table.misses, table.hitRate(), table.evictions
+
+class GameServer:
+    """A class that serves player2 games to many player1 clients at once from a single asyncio event loop.
+
+    Each connection gets its own BoardClass and a coroutine running the same game loop as player2.py,
+    with the computer taking player2's turns. The computer's searches run in a pool of worker processes,
+    so neither waiting on a client nor searching a move blocks the other games.
+
+    Attributes:
+        computerPlayer (MinimaxPlayer): MinimaxPlayer type object copied into every search worker, so the games searched
+            by a worker share its transposition table.
+        searchPool (ProcessPoolExecutor): ProcessPoolExecutor type object of the search workers.
+        cacheStats (dict[int, tuple[int, int, int, int, float, int]]): Maps the process id of each search worker to its
+            latest cache stats (see workerCacheStats).
+        numSessions (int): The number of clients currently connected.
+        numGames (int): The total number of games finished on this server.
+        gameLog (GameLog): GameLog type object that every finished game is appended to, or None.
+    """
+
+    def __init__(self, computerPlayer: MinimaxPlayer = None, gameLog: GameLog = None, numWorkers: int = None):
+        numWorkers = numWorkers or max(os.cpu_count() or 1, MIN_SEARCH_WORKERS)
+        # every worker keeps its own copy of the player's table, so the default budget is split between them
+        self.computerPlayer = computerPlayer if computerPlayer is not None else MinimaxPlayer(timeLimit=SEARCH_TIME, cacheSize=DEFAULT_CACHE_ENTRIES // numWorkers)
+        self.searchPool = ProcessPoolExecutor(numWorkers, initializer=startSearchWorker, initargs=(self.computerPlayer,))
+        self.cacheStats = {}
+        self.gameLog = gameLog
+        self.numSessions = 0
+        self.numGames = 0
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Exchange usernames with a newly connected player1 and play games with it until it leaves.
+
+        reader: asyncio.StreamReader type object of the connection with player1.
+        writer: asyncio.StreamWriter type object of the connection with player1.
+        """
+        self.numSessions += 1
+
+        try:
+            player1Name, boardSize, winLength = decodeHello(await self.expectMessage(reader, HELLO))
+            refusal = helloError(player1Name, boardSize, winLength)
+
+            if refusal:
+                writer.write(encodeMessage(ERROR, refusal.encode()))
+                await writer.drain()
+                return
+
+            playerBoard = BoardClass("player2", otherPlayer=player1Name, boardSize=boardSize, winLength=winLength)
+            writer.write(encodeMessage(HELLO, encodeHello(playerBoard.getPlayerName(), boardSize, winLength)))
+            await writer.drain()
+            await self.playGames(playerBoard, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError, InvalidMove):
+            # the client left or broke the protocol, which only ends its own game
+            pass
+        finally:
+            self.numSessions -= 1
+            writer.close()
+
+    async def expectMessage(self, reader: asyncio.StreamReader, messageType: int) -> bytes:
+        """Receive the next message, which must be of the given type.
+
+        Returns: The payload bytes of the message.
+        """
+        receivedType, payload = await readMessage(reader)
+
+        if receivedType != messageType:
+            raise ProtocolError(f"Expected message type {messageType}, received {receivedType}.")
+
+        return payload
+
+    async def determineBoardCondition(self, playerBoard: BoardClass, reader: asyncio.StreamReader) -> str:
+        """Determines the condition of the board, waiting for player1's REMATCH or BYE if the game is over.
+
+        Returns: "New Game", "End Game", or "Continue" if the game is not over.
+        """
+        if playerBoard.isWinner("O") or playerBoard.boardIsFull():
+            self.numGames += 1
+
+            if self.gameLog is not None:
+                # player1 plays X and player2 plays O
+                self.gameLog.appendGame(playerBoard, playerBoard.getOtherPlayer(), playerBoard.getPlayerName())
+
+            player1Response = (await readMessage(reader))[0]
+
+            if player1Response == REMATCH:
+                return "New Game"
+            elif player1Response == BYE:
+                return "End Game"
+            else:
+                raise ProtocolError(f"Expected a REMATCH or BYE message, received type {player1Response}.")
+
+        return "Continue"
+
+    async def playGames(self, playerBoard: BoardClass, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Plays out a series of games with one player1 client until it sends BYE.
+
+        Loops through player1's move, a board check, the computer's move, and another board check,
+        the same way as playGames in player2.py.
+        """
+        while True:
+            player1Move = decodeMove(await self.expectMessage(reader, MOVE), playerBoard.getBoardSize())
+            playerBoard.updateGameBoard(player1Move, "X")
+            playerBoard.setLastPlayer(playerBoard.getOtherPlayer())
+            boardCondition = await self.determineBoardCondition(playerBoard, reader)
+
+            if boardCondition == "Continue":
+                player2Move = await self.searchMove(playerBoard)
+                playerBoard.updateGameBoard(player2Move, "O")
+                playerBoard.setLastPlayer(playerBoard.getPlayerName())
+                writer.write(encodeMessage(MOVE, bytes([player2Move])))
+                await writer.drain()
+                boardCondition = await self.determineBoardCondition(playerBoard, reader)
+
+            if boardCondition == "New Game":
+                playerBoard.resetGameBoard()
+            elif boardCondition == "End Game":
+                writer.write(encodeMessage(ACK))
+                await writer.drain()
+                break
+
+    async def searchMove(self, playerBoard: BoardClass) -> int:
+        """Search the computer's move in a search worker, letting the other games run while it searches.
+
+        playerBoard: BoardClass type object of the game. It is not modified.
+
+        Returns: The tile (1 - boardSize squared) chosen by the computer.
+        """
+        loop = asyncio.get_running_loop()
+        player2Move, workerId, cacheStats = await loop.run_in_executor(
+            self.searchPool, workerSearch, playerBoard.getMoveHistory(), playerBoard.getBoardSize(), playerBoard.getWinLength())
+        self.cacheStats[workerId] = cacheStats
+        return player2Move
+
+    def printCacheStats(self) -> None:
+        """Print the size, hits, misses, and evictions of the transposition table of each search worker.
+        """
+        for workerId, (numEntries, maxEntries, hits, misses, hitRate, evictions) in self.cacheStats.items():
+            print(f"Worker {workerId} cache: {numEntries}/{maxEntries} positions, {hits} hits, {misses} misses "
+                  f"({hitRate:.1%} hit rate), {evictions} evictions")
+
+    def close(self) -> None:
+        """Stop the search workers.
+        """
+        self.searchPool.shutdown(cancel_futures=True)
+
+    async def serve(self, host: str, port: int) -> None:
+        """Accept player1 clients on host and port until the program is stopped.
+        """
+        server = await asyncio.start_server(self.handleClient, host, port, backlog=1024)
+
+        async with server:
+            await server.serve_forever()
+
+def main() -> None:
+    """Main function for running the program.
+
+    User inputs a host and port, then the server accepts player1 clients on them until it is stopped.
+    """
+    while True:
+        try:
+            host = input("Please enter the hostname or IP address to establish a connection for.\n").lower()
+            port = int(input("Please enter the port number that you want to connect through.\n"))
+            break
+        except ValueError:
+            print("Port must be an integer. Please try again.")
+
+    print("Waiting for connections...")
+    gameLog = GameLog()
+    server = GameServer(gameLog=gameLog)
+
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+        server.printCacheStats()
+    finally:
+        server.close()
+        gameLog.close()
+
+
+if __name__ == "__main__":
+    main()
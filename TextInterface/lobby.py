@@ -0,0 +1,147 @@
+# LOBBY
+from protocol import HELLO, JOIN, ERROR
+from protocol import encodeMessage, decodeHello, readMessage
+from collections import OrderedDict
+import asyncio
+
+class Lobby:
+    """A class that queues connecting players and pairs each player1 with a player2 in a game session.
+
+    A player1 connects exactly as it would to player2 and is recognized by its HELLO message, while a
+    player2 announces itself with a JOIN message. Waiting players are kept in insertion-ordered queues,
+    so pairing an arrival with the longest waiting player is O(1). Once paired, the lobby forwards the
+    stored HELLO to player2 and relays the raw bytes both ways, so both players run their usual
+    exchangeUsernames and playGames flow.
+
+    Attributes:
+        waitingPlayer1s (OrderedDict): Maps the user name of each waiting player1 to the future that pairs it.
+        waitingPlayer2s (OrderedDict): Maps a connection id of each waiting player2 to the future that pairs it.
+        numSessions (int): The number of game sessions currently being relayed.
+    """
+
+    def __init__(self):
+        self.waitingPlayer1s = OrderedDict()
+        self.waitingPlayer2s = OrderedDict()
+        self.numSessions = 0
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Queue a newly connected player, or pair it right away if a player of the other role is waiting.
+
+        reader: asyncio.StreamReader type object of the connection with the player.
+        writer: asyncio.StreamWriter type object of the connection with the player.
+        """
+        try:
+            messageType, payload = await readMessage(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        if messageType == HELLO:
+            queue, otherQueue = self.waitingPlayer1s, self.waitingPlayer2s
+            queueKey = decodeHello(payload)[0]
+            # player1's HELLO is held until there is a player2 to receive it
+            helloMessage = encodeMessage(HELLO, payload)
+        elif messageType == JOIN:
+            queue, otherQueue = self.waitingPlayer2s, self.waitingPlayer1s
+            queueKey = id(writer)
+            helloMessage = None
+        else:
+            writer.close()
+            return
+
+        if queueKey in queue:
+            # a player1 with the same user name is already waiting, so this one is told why it is refused
+            writer.write(encodeMessage(ERROR, f"The user name {queueKey} is already in use in the lobby.".encode()))
+            writer.close()
+            return
+
+        if otherQueue:
+            # the waiting player's handler runs the session, once its own pending read is cancelled
+            otherKey, paired = otherQueue.popitem(last=False)
+            paired.set_result((reader, writer, helloMessage))
+            return
+
+        paired = asyncio.get_running_loop().create_future()
+        queue[queueKey] = paired
+        # a waiting player sends nothing until it is paired, so any read result means it disconnected
+        disconnected = asyncio.ensure_future(reader.read(1))
+        await asyncio.wait((paired, disconnected), return_when=asyncio.FIRST_COMPLETED)
+
+        if not paired.done():
+            del queue[queueKey]
+            writer.close()
+            return
+
+        disconnected.cancel()
+        try:
+            await disconnected
+        except asyncio.CancelledError:
+            pass
+
+        otherReader, otherWriter, otherHello = paired.result()
+
+        if helloMessage is not None:
+            await self.runSession(reader, writer, helloMessage, otherReader, otherWriter)
+        else:
+            await self.runSession(otherReader, otherWriter, otherHello, reader, writer)
+
+    async def runSession(self, player1Reader: asyncio.StreamReader, player1Writer: asyncio.StreamWriter, helloMessage: bytes,
+                         player2Reader: asyncio.StreamReader, player2Writer: asyncio.StreamWriter) -> None:
+        """Relay a game session between a paired player1 and player2 until either one disconnects.
+
+        helloMessage: player1's framed HELLO message, which is sent to player2 first.
+        """
+        self.numSessions += 1
+
+        try:
+            player2Writer.write(helloMessage)
+            await asyncio.gather(self.relay(player1Reader, player2Writer), self.relay(player2Reader, player1Writer))
+        finally:
+            self.numSessions -= 1
+
+    async def relay(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Forward bytes from one player to the other until the sending player disconnects.
+        """
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        """Accept players on host and port until the program is stopped.
+        """
+        server = await asyncio.start_server(self.handleClient, host, port, backlog=4096)
+
+        async with server:
+            await server.serve_forever()
+
+def main() -> None:
+    """Main function for running the program.
+
+    User inputs a host and port, then the lobby pairs the players that connect to it until it is stopped.
+    """
+    while True:
+        try:
+            host = input("Please enter the hostname or IP address to establish a connection for.\n").lower()
+            port = int(input("Please enter the port number that you want to connect through.\n"))
+            break
+        except ValueError:
+            print("Port must be an integer. Please try again.")
+
+    print("Waiting for players...")
+
+    try:
+        asyncio.run(Lobby().serve(host, port))
+    except KeyboardInterrupt:
+        print("Lobby stopped.")
+
+
+if __name__ == "__main__":
+    main()
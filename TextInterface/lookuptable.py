@@ -0,0 +1,149 @@
+from gameboard import BoardClass
+from minimax import isWinningMove
+import mmap
+import os
+import sys
+
+# Default location of the generated table, next to this file.
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfectplay.bin")
+# One byte per base 3 board hash of the 3x3 board.
+TABLE_SIZE = 3 ** 9
+# Byte stored for unreachable positions and finished games, which have no move to make.
+NO_ENTRY = 0xFF
+# Game values stored in the low 2 bits of each entry, from the point of view of the player to move.
+LOSS = 0
+TIE = 1
+WIN = 2
+
+def boardHash(playerBoard: BoardClass) -> int:
+    """Compute the base 3 hash of a 3x3 game board, with 0 for an empty tile, 1 for X, and 2 for O.
+
+    playerBoard: BoardClass type object holding the position to hash.
+
+    Returns: An integer from 0 to 3 ** 9 - 1 that indexes the lookup table.
+    """
+    hashValue = 0
+
+    for tile in range(9, 0, -1):
+        letter = playerBoard.getGameBoardTile(tile)
+        hashValue = hashValue * 3 + (1 if letter == "X" else 2 if letter == "O" else 0)
+
+    return hashValue
+
+def generateTable(path: str = DEFAULT_TABLE_PATH) -> int:
+    """Enumerate every reachable 3x3 position and write the best move and game value of each to path.
+
+    Each entry is one byte at the position's boardHash offset, holding (best tile << 2) | game value,
+    or NO_ENTRY if there is no move to make. Ties between equally valued moves go to the fastest win
+    or the slowest loss.
+
+    path: File path that the table is written to.
+
+    Returns: The number of positions with a move to make that were written to the table.
+    """
+    startBoard = BoardClass("lookup")
+    cells = []
+
+    for tile in range(1, 10):
+        letter = startBoard.getGameBoardTile(tile)
+        cells.append(1 if letter == "X" else 2 if letter == "O" else 0)
+
+    table = bytearray([NO_ENTRY]) * TABLE_SIZE
+    scores = {}
+
+    def solve(hashValue: int, piece: int, emptyCount: int) -> int:
+        # scores wins by the empty tiles left before the winning move, so faster wins score higher
+        if hashValue in scores:
+            return scores[hashValue]
+
+        bestScore = None
+        bestTile = 0
+
+        for index in range(9):
+            if cells[index] != 0:
+                continue
+
+            cells[index] = piece
+            if isWinningMove(cells, 3, 3, index):
+                score = emptyCount
+            elif emptyCount == 1:
+                score = 0
+            else:
+                score = -solve(hashValue + piece * 3 ** index, 3 - piece, emptyCount - 1)
+            cells[index] = 0
+
+            if bestScore is None or score > bestScore:
+                bestScore = score
+                bestTile = index + 1
+
+        gameValue = WIN if bestScore > 0 else LOSS if bestScore < 0 else TIE
+        table[hashValue] = (bestTile << 2) | gameValue
+        scores[hashValue] = bestScore
+        return bestScore
+
+    emptyCount = cells.count(0)
+    solve(sum(piece * 3 ** index for index, piece in enumerate(cells)), 1 if emptyCount % 2 == 1 else 2, emptyCount)
+
+    with open(path, "wb") as tableFile:
+        tableFile.write(table)
+
+    return len(scores)
+
+class LookupTable:
+    """A perfect-play table for the 3x3 board, read through a memory map of the file from generateTable.
+
+    The file is only opened and mapped on the first lookup, so creating a LookupTable costs nothing at startup
+    and each lookup afterwards is a single indexed read.
+
+    Attributes:
+        path (str): File path of the generated table.
+        table (mmap): Read-only memory map of the table file, None until the first lookup.
+    """
+
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.path = path
+        self.table = None
+
+    def lookup(self, playerBoard: BoardClass) -> tuple[int, int]:
+        """Look up the best move and game value of a 3x3 game board position.
+
+        playerBoard: BoardClass type object holding the position, with the player to move decided by the piece counts.
+
+        Returns: A tuple of the best tile (1 - 9) and the game value (WIN, TIE, or LOSS) for the player to move.
+        """
+        if playerBoard.getBoardSize() != 3 or playerBoard.getWinLength() != 3:
+            raise ValueError("The lookup table only covers the 3x3 board with 3 in a row.")
+
+        if self.table is None:
+            with open(self.path, "rb") as tableFile:
+                self.table = mmap.mmap(tableFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        entry = self.table[boardHash(playerBoard)]
+
+        if entry == NO_ENTRY:
+            raise ValueError("The position is finished or cannot be reached in a game.")
+
+        return entry >> 2, entry & 0b11
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Choose the best move for a 3x3 game board, matching the MinimaxPlayer chooseMove interface.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, which must be the letter to move.
+
+        Returns: The tile (1 - 9) of the best move.
+        """
+        return self.lookup(playerBoard)[0]
+
+    def close(self) -> None:
+        """Close the memory map of the table file, if it was opened.
+        """
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+
+if __name__ == "__main__":
+    tablePath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_PATH
+    numPositions = generateTable(tablePath)
+    print(f"Wrote {numPositions} positions to {tablePath}.")
@@ -0,0 +1,210 @@
+from gameboard import BoardClass
+from minimax import isWinningMove
+import math
+import random
+import time
+
+# Exploration constant of the UCT formula, sqrt(2) for results between 0 and 1.
+EXPLORATION = math.sqrt(2)
+# Seconds spent searching each move when no other budget is given.
+MOVE_TIME = 1.0
+
+class MCTSNode:
+    """A class that holds one position of the search tree, reached by one move from its parent.
+
+    Attributes:
+        parent (MCTSNode): The node this node's move was played from, or None for the root.
+        move (int): The board index (tile - 1) of the move that reached this node, or None for the root.
+        piece (int): The piece that played the move, 1 for X or 2 for O.
+        children (list[MCTSNode]): The nodes of the moves tried from this position.
+        untriedMoves (list[int]): The board indexes of the moves not yet tried from this position, in random order.
+        visits (int): The number of rollouts that passed through this node.
+        score (float): The rollout results from the point of view of piece, 1 for each win and 0.5 for each tie.
+        winner (int): The piece that won with this node's move, 0 for a tie, or None if the game is not over.
+    """
+
+    __slots__ = ("parent", "move", "piece", "children", "untriedMoves", "visits", "score", "winner")
+
+    def __init__(self, parent: "MCTSNode", move: int, piece: int, untriedMoves: list[int], winner: int = None):
+        self.parent = parent
+        self.move = move
+        self.piece = piece
+        self.children = []
+        self.untriedMoves = untriedMoves
+        self.visits = 0
+        self.score = 0.0
+        self.winner = winner
+
+    def selectChild(self, exploration: float) -> "MCTSNode":
+        """Choose the child with the highest UCT value, balancing its average result against how rarely it was tried.
+
+        Returns: The selected child node.
+        """
+        logVisits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.score / child.visits + exploration * math.sqrt(logVisits / child.visits))
+
+class MCTSPlayer:
+    """A computer player that chooses its moves with a Monte Carlo tree search, for boards too large for minimax.
+
+    Each rollout walks down the tree by UCT selection, adds one new node, then plays random moves to the end
+    of the game on a bytearray copy of the board. The search stops at a time or rollout budget, so a move takes
+    a bounded time on any board size. After a move, the subtree below the chosen move is kept, and the next
+    search starts from the node of the opponent's reply, so the rollouts of earlier turns are reused.
+
+    Attributes:
+        timeLimit (float): The seconds to search each move, or None for no time limit.
+        maxRollouts (int): The number of rollouts to run each move, or None for no rollout limit.
+        exploration (float): The exploration constant of the UCT formula.
+        rng (Random): Random type object used by the rollouts, seeded for repeatable games.
+        root (MCTSNode): The node of the position after this player's last move, or None.
+        rootCells (bytearray): The board of root, EMPTY, X_PIECE, or O_PIECE for each tile.
+        rolloutsRun (int): The number of rollouts run for the last move.
+    """
+
+    def __init__(self, timeLimit: float = MOVE_TIME, maxRollouts: int = None, exploration: float = EXPLORATION, seed: int = None):
+        if timeLimit is None and maxRollouts is None:
+            raise ValueError("MCTSPlayer needs a time limit or a rollout limit.")
+
+        self.timeLimit = timeLimit
+        self.maxRollouts = maxRollouts
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.root = None
+        self.rootCells = None
+        self.rolloutsRun = 0
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Search the current position of a game board for the best move within the time or rollout budget.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, either X or O.
+
+        Returns: The tile (1 - boardSize squared) of the most visited move, or a move that wins at once.
+        """
+        root = self.searchPosition(playerBoard, playerLetter)
+        cells = playerBoard.getCells()
+        piece = 1 if playerLetter == "X" else 2
+        winningChild = next((child for child in root.children if child.winner == piece), None)
+        bestChild = winningChild if winningChild is not None else max(root.children, key=lambda child: child.visits)
+
+        # keeps the subtree of the chosen move for the next search
+        bestChild.parent = None
+        self.root = bestChild
+        self.rootCells = cells
+        self.rootCells[bestChild.move] = piece
+        return bestChild.move + 1
+
+    def searchPosition(self, playerBoard: BoardClass, playerLetter: str) -> MCTSNode:
+        """Run rollouts from the current position of a game board until the time or rollout budget runs out.
+
+        playerBoard: BoardClass type object holding the position to search. It is not modified.
+        playerLetter: The letter of the player to move, either X or O.
+
+        Returns: The root node of the search, with a child for every move tried.
+        """
+        self.boardSize = playerBoard.getBoardSize()
+        self.winLength = playerBoard.getWinLength()
+        cells = playerBoard.getCells()
+        root = self.findRoot(cells, 1 if playerLetter == "X" else 2)
+        deadline = time.monotonic() + self.timeLimit if self.timeLimit is not None else None
+        self.rolloutsRun = 0
+
+        while True:
+            self.runRollout(root, cells)
+            self.rolloutsRun += 1
+
+            if self.maxRollouts is not None and self.rolloutsRun >= self.maxRollouts:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        return root
+
+    def findRoot(self, cells: bytearray, piece: int) -> MCTSNode:
+        """Find the node of the current position in the tree kept from the last move, or start a new tree.
+
+        The kept tree is reused when the only change since this player's last move is one opponent move.
+
+        cells: The current board, EMPTY, X_PIECE, or O_PIECE for each tile.
+        piece: The piece of the player to move, 1 for X or 2 for O.
+
+        Returns: The root node to search from.
+        """
+        if self.root is not None and len(self.rootCells) == len(cells):
+            changedIndexes = [index for index in range(len(cells)) if cells[index] != self.rootCells[index]]
+
+            if len(changedIndexes) == 1 and self.rootCells[changedIndexes[0]] == 0 and cells[changedIndexes[0]] == 3 - piece:
+                for child in self.root.children:
+                    if child.move == changedIndexes[0]:
+                        child.parent = None
+                        return child
+
+        emptyIndexes = [index for index in range(len(cells)) if cells[index] == 0]
+        self.rng.shuffle(emptyIndexes)
+        # the root's piece is the one that moved into the position, so its children are this player's moves
+        return MCTSNode(None, None, 3 - piece, emptyIndexes)
+
+    def runRollout(self, root: MCTSNode, rootCells: bytearray) -> None:
+        """Run one rollout: select down the tree, expand one node, play randomly to the end, and record the result.
+
+        root: The node to search from.
+        rootCells: The board of root. It is not modified.
+        """
+        node = root
+        cells = bytearray(rootCells)
+
+        # selection, through nodes whose moves have all been tried
+        while not node.untriedMoves and node.children and node.winner is None:
+            node = node.selectChild(self.exploration)
+            cells[node.move] = node.piece
+
+        # expansion, by one untried move
+        if node.untriedMoves and node.winner is None:
+            move = node.untriedMoves.pop()
+            piece = 3 - node.piece
+            cells[move] = piece
+            emptyIndexes = [index for index in range(len(cells)) if cells[index] == 0]
+            self.rng.shuffle(emptyIndexes)
+
+            if isWinningMove(cells, self.boardSize, self.winLength, move):
+                winner = piece
+            elif not emptyIndexes:
+                winner = 0
+            else:
+                winner = None
+
+            child = MCTSNode(node, move, piece, emptyIndexes if winner is None else [], winner)
+            node.children.append(child)
+            node = child
+
+        winner = node.winner if node.winner is not None else self.playOut(cells, 3 - node.piece)
+
+        # backpropagation, scoring each node for the piece that moved into it
+        while node is not None:
+            node.visits += 1
+            if winner == node.piece:
+                node.score += 1.0
+            elif winner == 0:
+                node.score += 0.5
+            node = node.parent
+
+    def playOut(self, cells: bytearray, piece: int) -> int:
+        """Play random moves on cells until the game ends. cells is modified.
+
+        cells: The board to play out, EMPTY, X_PIECE, or O_PIECE for each tile.
+        piece: The piece of the player to move, 1 for X or 2 for O.
+
+        Returns: The piece that won, or 0 for a tie.
+        """
+        emptyIndexes = [index for index in range(len(cells)) if cells[index] == 0]
+        self.rng.shuffle(emptyIndexes)
+
+        for index in emptyIndexes:
+            cells[index] = piece
+
+            if isWinningMove(cells, self.boardSize, self.winLength, index):
+                return piece
+
+            piece = 3 - piece
+
+        return 0
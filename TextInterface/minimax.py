@@ -0,0 +1,303 @@
+from gameboard import BoardClass
+from gameboard import LINE_DIRECTIONS
+from gameboard import zobristKeys
+from evalcache import EvaluationCache
+from evalcache import DEFAULT_CACHE_ENTRIES
+from symmetry import canonicalKey
+from symmetry import canonicalTile
+from symmetry import originalTile
+import time
+
+# Bound types stored with each transposition table value, since alpha-beta cutoffs leave some values inexact.
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+# Number of positions searched between checks of the clock against the move deadline.
+CLOCK_CHECK_INTERVAL = 1024
+# Number of killer moves kept for each ply.
+NUM_KILLERS = 2
+
+class SearchTimeout(Exception):
+    """Custom exception raised inside a search once the move deadline has passed, unwinding back to chooseMove.
+    """
+    pass
+
+def isWinningMove(cells: list[int], boardSize: int, winLength: int, index: int) -> bool:
+    """Check if the piece at index completes a line of winLength, counting outward from that index.
+
+    cells: Flat list of the board tiles, 0 for an empty tile, 1 for X, and 2 for O.
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same piece that must be aligned to win.
+    index: The index (tile - 1) of the piece that was just placed.
+
+    Returns: True if the piece at index is part of a winning line.
+    """
+    piece = cells[index]
+    row, col = divmod(index, boardSize)
+
+    for rowStep, colStep in LINE_DIRECTIONS:
+        lineCount = 1
+
+        for direction in (1, -1):
+            i = row + rowStep * direction
+            j = col + colStep * direction
+
+            while lineCount < winLength and 0 <= i < boardSize and 0 <= j < boardSize and cells[i * boardSize + j] == piece:
+                lineCount += 1
+                i += rowStep * direction
+                j += colStep * direction
+
+        if lineCount >= winLength:
+            return True
+
+    return False
+
+class MinimaxPlayer:
+    """A computer player that chooses its moves with an iterative deepening negamax search using alpha-beta pruning.
+
+    The search runs on a flat list copy of a BoardClass game board and stores searched positions in a
+    transposition table keyed by the Zobrist key of the board, which starts from the game board's own key
+    and is updated with one XOR per move searched, so repeated positions (within one search, and across
+    moves and games) are only searched once. The table is one EvaluationCache of at most cacheSize positions
+    shared by every board size, with each key led by the board size and win length, so a long-running player
+    evicts its least recently used positions instead of growing without limit, however many board sizes it plays.
+    With useSymmetry, the table is keyed by the D4 canonical key of each position instead, so the 8 rotations
+    and reflections of a position share one entry, with its best move stored on the canonical position and
+    mapped back to each position that reads it.
+
+    With a time limit, the search deepens one ply at a time and keeps the best move of the last finished
+    depth, so a move is ready at the deadline on any board size. Games unfinished at the search depth score
+    as ties. Each depth tries the best move of the last depth first, then the killer moves that caused cutoffs
+    at the same ply, then the center and the corners of each ring around it. Without a time or depth limit,
+    the whole game tree is searched at once, which is only practical on small boards.
+
+    Attributes:
+        useSymmetry (bool): Determines if the transposition table is keyed by canonical position keys.
+        timeLimit (float): The seconds to search each move, or None for no time limit.
+        maxDepth (int): The deepest number of plies to search, or None to search to the end of the game.
+        cacheSize (int): The most positions kept in the transposition table.
+        transpositionTable (EvaluationCache): Maps a (boardSize, winLength, board key) tuple to a searched value,
+            its bound type, the depth it was searched to, and the board index of the best move found.
+        nodesSearched (int): The total number of positions searched by this player.
+        completedDepth (int): The deepest depth fully searched for the last move.
+    """
+
+    def __init__(self, useSymmetry: bool = False, timeLimit: float = None, maxDepth: int = None, cacheSize: int = DEFAULT_CACHE_ENTRIES):
+        self.useSymmetry = useSymmetry
+        self.timeLimit = timeLimit
+        self.maxDepth = maxDepth
+        self.cacheSize = cacheSize
+        self.transpositionTable = EvaluationCache(cacheSize)
+        self.nodesSearched = 0
+        self.completedDepth = 0
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Search the current position of a game board for the best move, within the time and depth limits.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, either X or O.
+
+        Returns: The tile (1 - boardSize squared) of the best move of the deepest finished search.
+        """
+        self.boardSize = playerBoard.getBoardSize()
+        self.winLength = playerBoard.getWinLength()
+        self.zobristTable = zobristKeys(self.boardSize * self.boardSize)
+        self.moveOrder = self.centerFirstOrder()
+
+        cells = []
+        boardKey = playerBoard.getZobristKey()
+
+        for index in range(self.boardSize * self.boardSize):
+            letter = playerBoard.getGameBoardTile(index + 1)
+            cells.append(1 if letter == "X" else 2 if letter == "O" else 0)
+
+        piece = 1 if playerLetter == "X" else 2
+        emptyCount = cells.count(0)
+        self.deadline = time.monotonic() + self.timeLimit if self.timeLimit is not None else None
+        self.killers = [[] for ply in range(emptyCount)]
+        finalDepth = emptyCount if self.maxDepth is None else min(self.maxDepth, emptyCount)
+        # shallower searches only pay off as a fallback at a deadline or for move ordering under one
+        firstDepth = 1 if self.deadline is not None else finalDepth
+        # holds a move before any depth is finished, in case the deadline passes during the first
+        bestMove = next(index for index in self.moveOrder if cells[index] == 0)
+        self.completedDepth = 0
+
+        for depth in range(firstDepth, finalDepth + 1):
+            try:
+                bestMove, bestValue = self.searchRoot(cells, piece, boardKey, emptyCount, depth, bestMove)
+            except SearchTimeout:
+                break
+
+            self.completedDepth = depth
+
+            if abs(bestValue) > emptyCount - depth:
+                # a forced win or loss within the searched plies was found, which a deeper search cannot change;
+                # table entries from earlier, deeper searches can give a shallow depth a longer win it did not prove,
+                # and deepening further may still find a faster one
+                break
+
+        return bestMove + 1
+
+    def searchRoot(self, cells: list[int], piece: int, boardKey: int, emptyCount: int, depth: int, previousBest: int) -> tuple[int, int]:
+        """Search every move of the current position to depth, starting with the best move of the last depth.
+
+        Returns: A tuple of the board index of the best move and its negamax value.
+        """
+        alpha = -emptyCount - 1
+        bestMove = None
+
+        for index in self.orderMoves(cells, previousBest, 0):
+            value = self.scoreMove(cells, piece, index, boardKey, emptyCount, depth, 0, alpha, emptyCount + 1)
+
+            if bestMove is None or value > alpha:
+                alpha = value
+                bestMove = index
+
+        return bestMove, alpha
+
+    def centerFirstOrder(self) -> list[int]:
+        """Order the board indexes from the center outward, as central tiles are part of the most lines.
+
+        Within each ring around the center, the corners of the ring come before its other tiles, as the
+        corners of the 3x3 board are part of more lines than its edges.
+
+        Returns: A list of every board index, closest to the center first.
+        """
+        center = (self.boardSize - 1) / 2
+
+        def ringOrder(index: int) -> tuple[float, bool]:
+            rowDistance = abs(index // self.boardSize - center)
+            colDistance = abs(index % self.boardSize - center)
+            return max(rowDistance, colDistance), rowDistance != colDistance
+
+        return sorted(range(self.boardSize * self.boardSize), key=ringOrder)
+
+    def orderMoves(self, cells: list[int], firstMove: int, ply: int) -> list[int]:
+        """Order the empty tiles of a position for searching, so that alpha-beta cuts off as early as possible.
+
+        cells: Flat list of the board tiles, 0 for an empty tile, 1 for X, and 2 for O.
+        firstMove: The board index of the best move found for this position before, or None.
+        ply: The number of moves between the position searched by chooseMove and this position.
+
+        Returns: The board indexes of the empty tiles: firstMove, then the killer moves of ply, then the center first order.
+        """
+        moves = [firstMove] if firstMove is not None and cells[firstMove] == 0 else []
+
+        for index in self.killers[ply]:
+            if cells[index] == 0 and index not in moves:
+                moves.append(index)
+
+        if not moves:
+            return [index for index in self.moveOrder if cells[index] == 0]
+
+        return moves + [index for index in self.moveOrder if cells[index] == 0 and index not in moves]
+
+    def scoreMove(self, cells: list[int], piece: int, index: int, boardKey: int, emptyCount: int, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """Score placing piece at index from the point of view of the player placing it, searching depth plies.
+
+        Wins are scored by the number of empty tiles before the move, so that faster wins score higher.
+        cells is restored before returning.
+
+        Returns: The negamax value of the move.
+        """
+        cells[index] = piece
+
+        if isWinningMove(cells, self.boardSize, self.winLength, index):
+            value = emptyCount
+        elif emptyCount == 1 or depth == 1:
+            # the move filled the board without a win, or reached the search depth with the game unfinished
+            value = 0
+        else:
+            value = -self.negamax(cells, 3 - piece, boardKey ^ self.zobristTable[index][piece], emptyCount - 1, depth - 1, ply + 1, -beta, -alpha)
+
+        cells[index] = 0
+        return value
+
+    def negamax(self, cells: list[int], piece: int, boardKey: int, emptyCount: int, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """Search a position to depth with alpha-beta pruning, using and filling the transposition table.
+
+        cells: Flat list of the board tiles, 0 for an empty tile, 1 for X, and 2 for O.
+        piece: The piece of the player to move, 1 for X or 2 for O.
+        boardKey: The Zobrist key of cells.
+        emptyCount: The number of empty tiles in cells.
+        depth: The number of plies left to search.
+        ply: The number of moves between the position searched by chooseMove and this position.
+        alpha: The lowest value the player to move is already guaranteed.
+        beta: The highest value the opponent will allow.
+
+        Returns: The value of the position for the player to move.
+        """
+        self.nodesSearched += 1
+
+        if self.deadline is not None and self.nodesSearched % CLOCK_CHECK_INTERVAL == 0 and time.monotonic() >= self.deadline:
+            raise SearchTimeout
+
+        # a search past the end of the game is the same as a search to the end of the game
+        depth = min(depth, emptyCount)
+        originalAlpha = alpha
+        if self.useSymmetry:
+            positionKey, transformIndex = canonicalKey(cells, self.boardSize)
+        else:
+            positionKey = boardKey
+        # the same board key means a different position on another board size or win length
+        tableKey = (self.boardSize, self.winLength, positionKey)
+        entry = self.transpositionTable.get(tableKey)
+        hashMove = None
+
+        if entry is not None:
+            value, bound, entryDepth, hashMove = entry
+
+            if self.useSymmetry:
+                # symmetric positions share the entry, so its best move is stored on the canonical position
+                hashMove = originalTile(hashMove + 1, transformIndex, self.boardSize) - 1
+
+            # a value from a shallower search can still order the moves, but not replace this search
+            if entryDepth >= depth:
+                if bound == EXACT:
+                    return value
+                elif bound == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+
+                if alpha >= beta:
+                    return value
+
+        bestValue = -emptyCount - 1
+        bestMove = None
+
+        for index in self.orderMoves(cells, hashMove, ply):
+            value = self.scoreMove(cells, piece, index, boardKey, emptyCount, depth, ply, alpha, beta)
+
+            if value > bestValue:
+                bestValue = value
+                bestMove = index
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.addKiller(ply, index)
+                        break
+
+        if self.useSymmetry:
+            bestMove = canonicalTile(bestMove + 1, transformIndex, self.boardSize) - 1
+
+        if bestValue <= originalAlpha:
+            self.transpositionTable.put(tableKey, (bestValue, UPPER_BOUND, depth, bestMove))
+        elif bestValue >= beta:
+            self.transpositionTable.put(tableKey, (bestValue, LOWER_BOUND, depth, bestMove))
+        else:
+            self.transpositionTable.put(tableKey, (bestValue, EXACT, depth, bestMove))
+
+        return bestValue
+
+    def addKiller(self, ply: int, index: int) -> None:
+        """Remember a move that caused a cutoff, to be tried early in other positions at the same ply.
+
+        ply: The number of moves between the position searched by chooseMove and the position of the cutoff.
+        index: The board index of the move.
+        """
+        plyKillers = self.killers[ply]
+
+        if index not in plyKillers:
+            plyKillers.insert(0, index)
+            del plyKillers[NUM_KILLERS:]
@@ -0,0 +1,115 @@
+from gameboard import BoardClass
+from mcts import MCTSPlayer, EXPLORATION, MOVE_TIME
+import multiprocessing
+import os
+import random
+
+# Seconds of the move deadline kept back from the workers' searches, for sending their results back in time.
+RESULT_MARGIN = 0.05
+# Seconds past the move deadline to wait for the workers' results, before playing a fallback move instead.
+RESULT_TIMEOUT = 1.0
+
+def searchShard(shard: tuple[bytes, int, int, str, float, int, float, int]) -> list[tuple[int, int, float, bool]]:
+    """Search a position with an MCTSPlayer in a worker process, building the board there so only bytes are sent.
+
+    shard: A tuple of the board cells, the board size, the win length, the letter to move, the time limit, the
+    rollout limit, the exploration constant, and the worker's seed.
+
+    Returns: A list with a (board index, visits, score, wins at once) tuple for each move tried at the root,
+    instead of the worker's whole tree.
+    """
+    cells, boardSize, winLength, playerLetter, timeLimit, maxRollouts, exploration, seed = shard
+    playerBoard = BoardClass("worker", boardSize=boardSize, winLength=winLength)
+    playerBoard.gameBoard[:] = cells
+    piece = 1 if playerLetter == "X" else 2
+    root = MCTSPlayer(timeLimit, maxRollouts, exploration, seed).searchPosition(playerBoard, playerLetter)
+    return [(child.move, child.visits, child.score, child.winner == piece) for child in root.children]
+
+class ParallelSearchPlayer:
+    """A computer player that runs a root-parallel Monte Carlo tree search across a pool of worker processes.
+
+    Every worker searches the same position with its own seed until the move deadline, then returns only the
+    visit counts and scores of the root's moves. The counts are summed over the workers and the most visited
+    move is played, so with n workers a move gets about n times the rollouts of MCTSPlayer in the same time.
+    The workers are started with the player, so the first move does not pay for starting them. If their
+    results do not arrive within RESULT_TIMEOUT of the deadline, the pool is replaced and the empty tile
+    closest to the center is played, so a stuck worker cannot hang the game.
+
+    Attributes:
+        numWorkers (int): The number of worker processes.
+        timeLimit (float): The seconds to take for each move, or None for no time limit.
+        maxRollouts (int): The number of rollouts to run each move, split between the workers, or None for no rollout limit.
+        exploration (float): The exploration constant of the UCT formula.
+        rng (Random): Random type object that the workers' seeds are drawn from.
+        pool (Pool): multiprocessing Pool type object of the workers.
+        rolloutsRun (int): The number of rollouts run by all workers for the last move.
+    """
+
+    def __init__(self, numWorkers: int = None, timeLimit: float = MOVE_TIME, maxRollouts: int = None, exploration: float = EXPLORATION, seed: int = None):
+        if timeLimit is None and maxRollouts is None:
+            raise ValueError("ParallelSearchPlayer needs a time limit or a rollout limit.")
+
+        self.numWorkers = numWorkers or os.cpu_count() or 1
+        self.timeLimit = timeLimit
+        self.maxRollouts = maxRollouts
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.pool = multiprocessing.Pool(self.numWorkers)
+        self.rolloutsRun = 0
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Search the current position of a game board across the workers for the best move, within the deadline.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, either X or O.
+
+        Returns: The tile (1 - boardSize squared) of the move with the most visits over all workers, or a move that wins at once.
+        The empty tile closest to the center if the workers' results do not arrive in time.
+        """
+        workerTime = max(self.timeLimit - RESULT_MARGIN, RESULT_MARGIN) if self.timeLimit is not None else None
+        workerRollouts = -(-self.maxRollouts // self.numWorkers) if self.maxRollouts is not None else None
+        cells = bytes(playerBoard.getCells())
+        shards = [(cells, playerBoard.getBoardSize(), playerBoard.getWinLength(), playerLetter, workerTime, workerRollouts,
+                   self.exploration, self.rng.randrange(2 ** 32)) for worker in range(self.numWorkers)]
+
+        try:
+            # with only a rollout limit there is no deadline, so the results are waited for as long as they take
+            allResults = self.pool.map_async(searchShard, shards).get(self.timeLimit + RESULT_TIMEOUT if self.timeLimit is not None else None)
+        except multiprocessing.TimeoutError:
+            # a stuck worker would block every later move too, so the whole pool is replaced
+            self.pool.terminate()
+            self.pool = multiprocessing.Pool(self.numWorkers)
+            self.rolloutsRun = 0
+            return self.fallbackMove(cells, playerBoard.getBoardSize()) + 1
+
+        moveVisits = {}
+        self.rolloutsRun = 0
+
+        for move, visits, score, winsAtOnce in (result for shardResults in allResults for result in shardResults):
+            if winsAtOnce:
+                return move + 1
+
+            moveVisits[move] = moveVisits.get(move, 0) + visits
+            self.rolloutsRun += visits
+
+        return max(moveVisits, key=moveVisits.get) + 1
+
+    def fallbackMove(self, cells: bytes, boardSize: int) -> int:
+        """Choose a move without searching, for when the workers' results do not arrive in time.
+
+        cells: The current board, EMPTY, X_PIECE, or O_PIECE for each tile.
+        boardSize: The number of rows and columns on the board.
+
+        Returns: The board index (tile - 1) of the empty tile closest to the center.
+        """
+        center = (boardSize - 1) / 2
+        emptyIndexes = [index for index in range(len(cells)) if cells[index] == 0]
+        return min(emptyIndexes, key=lambda index: abs(index // boardSize - center) + abs(index % boardSize - center))
+
+    def close(self) -> None:
+        """Stop the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -1,8 +1,21 @@
 # CLIENT
 from gameboard import InvalidMove
 from gameboard import BoardClass
+from protocol import MessageStream
+from protocol import RequestRefused
+from protocol import HELLO, MOVE, REMATCH, BYE, ACK, MAX_NAME_BYTES
+from protocol import encodeHello, decodeHello, decodeMove
+from renderer import TextRenderer
+from statsstore import StatsStore
 import socket
 
+# Shows the game on the terminal; any object with the TextRenderer methods, such as a NullRenderer, can replace it.
+renderer = TextRenderer()
+
+# Board size and win length of the games played; both players must use the same values.
+BOARD_SIZE = 3
+WIN_LENGTH = 3
+
 def establishConnection(s: socket) -> None:
     """Takes in a user input host and port, then attempts to make a connection with those over the socket.
 
@@ -12,14 +25,14 @@ def establishConnection(s: socket) -> None:
     port = int(input("Please enter the port number that you want to connect through.\n"))
     s.connect((host, port))
 
-def exchangeUsernames(s: socket, playerBoard: BoardClass) -> None:
-    """Sends username to player2, receives player2's username, sets otherPlayer attribute.
+def exchangeUsernames(stream: MessageStream, playerBoard: BoardClass) -> None:
+    """Sends username and board settings to player2, receives player2's username, sets otherPlayer attribute.
 
-    s: socket type object representing the socket connection with player2.
+    stream: MessageStream type object representing the socket connection with player2.
     playerBoard: BoardClass type object that stores all of the game information for player1.
     """
-    s.sendall(playerBoard.getPlayerName().encode())
-    player2Name = s.recv(1024).decode()
+    stream.sendMessage(HELLO, encodeHello(playerBoard.getPlayerName(), playerBoard.getBoardSize(), playerBoard.getWinLength()))
+    player2Name, boardSize, winLength = decodeHello(stream.expectMessage(HELLO))
     playerBoard.setOtherPlayer(player2Name)
 
 def beginGame(playerBoard: BoardClass) -> None:
@@ -27,24 +40,24 @@ def beginGame(playerBoard: BoardClass) -> None:
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
     """
-    playerBoard.printInstructions()
-    print("Start Game.")
-    playerBoard.printBoard()
+    renderer.renderStart(playerBoard)
 
-def takeTurn(playerBoard: BoardClass, s: socket) -> None:
+def takeTurn(playerBoard: BoardClass, stream: MessageStream) -> None:
     """Plays out an entire turn for player1.
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
-    s: socket type object representing the socket connection with player2.
+    stream: MessageStream type object representing the socket connection with player2.
 
     User inputs what move they want to make. If valid, the board is updated, printed out,
     and the move is sent to player2 over the socket.
     """
+    numTiles = playerBoard.getBoardSize() * playerBoard.getBoardSize()
+
     while True:
         try:
-            player1Move = int(input("Enter your move (number from 1 - 9): "))
+            player1Move = int(input(f"Enter your move (number from 1 - {numTiles}): "))
         
-            if not 1 <= player1Move <= 9:
+            if not 1 <= player1Move <= numTiles:
                 raise ValueError
 
             playerBoard.updateGameBoard(player1Move, "X")
@@ -56,99 +69,109 @@ def takeTurn(playerBoard: BoardClass, s: socket) -> None:
             # Custom exception triggered when a game piece is already placed on input tile.
             print("That tile has already been played. Please try again.")
         
-    playerBoard.printBoard()
-    s.sendall(str(player1Move).encode())
+    renderer.renderBoard(playerBoard)
+    stream.sendMessage(MOVE, bytes([player1Move]))
     # For this and future uses, upkeeps the lastPlayer attribute after a move is made.
     playerBoard.setLastPlayer(playerBoard.getPlayerName())
 
-def otherPlayerTurn(playerBoard: BoardClass, s: socket) -> None:
+def otherPlayerTurn(playerBoard: BoardClass, stream: MessageStream) -> None:
     """Plays out an entire turn for player2.
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
-    s: socket type object representing the socket connection with player2.
+    stream: MessageStream type object representing the socket connection with player2.
 
     Receives player2's move over the socket, updates gameboard with their move, outputs updated board.
     """
     # Output to terminal while waiting for player2 to make their move.
     print(f"{playerBoard.getOtherPlayer()}'s Turn...")
-    player2Move = int(s.recv(1024).decode())
+    player2Move = decodeMove(stream.expectMessage(MOVE), playerBoard.getBoardSize())
     playerBoard.updateGameBoard(player2Move, "O")
-    playerBoard.printBoard()
+    renderer.renderBoard(playerBoard)
     playerBoard.setLastPlayer(playerBoard.getOtherPlayer())
 
-def determineBoardCondition(playerBoard: BoardClass) -> str:
+def determineBoardCondition(playerBoard: BoardClass, statsStore: StatsStore = None) -> str:
     """Determines the condition of the board and how to respond.
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
+    statsStore: StatsStore type object that player1's stats are saved to at the end of each game, or None.
 
     If there is no winner or tie, play continues. If a game-ending event occurs, user inputs
     whether they want to play again. If so, determines for a new game to be played, determines
     to end the games if not.
     """
-    if playerBoard.isWinner("X") or playerBoard.boardIsFull():
-        playAgain = input("Do you want to play again? (y/n)\n").lower()
-
-        while playAgain != "y" and playAgain != "n":
-            playAgain = input("Invalid input. Please enter y or n.\n").lower()
-
-        if playAgain == "y":
-            return "New Game"
-        elif playAgain == "n":
-            return "End Game"
+    if playerBoard.isWinner("X"):
+        renderer.renderResult("X", playerBoard.getGameBoardTile(playerBoard.getLastTile()))
+    elif playerBoard.boardIsFull():
+        renderer.renderResult("X", "")
     else:
         # "Continue" is a filler return value when "New Game" and "End Game" do not apply
         return "Continue"
 
-def newGame(playerBoard: BoardClass, s: socket) -> None:
+    if statsStore is not None:
+        statsStore.saveStats(playerBoard.getPlayerName(), playerBoard)
+
+    playAgain = input("Do you want to play again? (y/n)\n").lower()
+
+    while playAgain != "y" and playAgain != "n":
+        playAgain = input("Invalid input. Please enter y or n.\n").lower()
+
+    if playAgain == "y":
+        return "New Game"
+    elif playAgain == "n":
+        return "End Game"
+
+def newGame(playerBoard: BoardClass, stream: MessageStream) -> None:
     """Establishes a new game by clearing the gameboard and beginning a game, messages player2 to play again.
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
+    stream: MessageStream type object representing the socket connection with player2.
     """
-    s.sendall("Play Again".encode())
+    stream.sendMessage(REMATCH)
     playerBoard.resetGameBoard()
     beginGame(playerBoard)
 
-def endGame(s: socket) -> None:
-    """Sends 'fun times' over the socket to signify ending the game, closes socket upon player2 confirmation.
+def endGame(stream: MessageStream) -> None:
+    """Sends a BYE message to signify ending the game, closes socket upon player2's ACK confirmation.
 
-    s: socket type object representing the socket connection with player2.
+    stream: MessageStream type object representing the socket connection with player2.
     """
-    s.sendall("Fun Times".encode())
+    stream.sendMessage(BYE)
     # Waits for message from player2 to make sure the server connection is closed before the socket.
-    waitToClose = s.recv(1024).decode()
+    stream.expectMessage(ACK)
     print("Closing socket.\n")
-    s.close()
+    stream.close()
 
-def playGames(playerBoard: BoardClass, s: socket) -> None:
+def playGames(playerBoard: BoardClass, stream: MessageStream, statsStore: StatsStore = None) -> None:
     """Plays out a series of games until the user decides to stop playing.
 
     playerBoard: BoardClass type object that stores all of the game information for player1.
-    s: socket type object representing the socket connection with player2.
+    stream: MessageStream type object representing the socket connection with player2.
+    statsStore: StatsStore type object that player1's stats are saved to at the end of each game, or None.
 
     Loops through player1 taking their turn, checking if game-ending condition occurred,
     player2 taking their turn, then checking again if game-ending condition occurred. When a
     game-ending condition occurs, either starts a new game, or ends the game/program altogether.
     """
     while True:
-        takeTurn(playerBoard, s)
-        boardCondition = determineBoardCondition(playerBoard)
+        takeTurn(playerBoard, stream)
+        boardCondition = determineBoardCondition(playerBoard, statsStore)
         
         if boardCondition == "New Game":
             # New game is started, restarts loop so that player1 has first turn.
-            newGame(playerBoard, s)
+            newGame(playerBoard, stream)
             continue
         elif boardCondition == "End Game":
             # Games are fully ended by breaking out of this function loop.
-            endGame(s)
+            endGame(stream)
             break
         
-        otherPlayerTurn(playerBoard, s)
-        boardCondition = determineBoardCondition(playerBoard)
+        otherPlayerTurn(playerBoard, stream)
+        boardCondition = determineBoardCondition(playerBoard, statsStore)
 
         if boardCondition == "New Game":
-            newGame(playerBoard, s)
+            newGame(playerBoard, stream)
         elif boardCondition == "End Game":
-            endGame(s)
+            endGame(stream)
             break
 
 def retryConnection() -> bool:
@@ -179,20 +202,27 @@ def main() -> None:
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     userName = input("Please input your username, no special characters.\n")
 
-    # ensures the username is alphanumeric
-    while not userName.isalnum():
-        userName = input("Invalid username. All characters must be alphanumeric. Try again.\n")
+    # ensures the username is alphanumeric and short enough for player2 to accept
+    while not userName.isalnum() or len(userName.encode()) > MAX_NAME_BYTES:
+        userName = input(f"Invalid username. All characters must be alphanumeric, up to {MAX_NAME_BYTES} bytes. Try again.\n")
 
     # playerBoard becomes player1's BoardClass object
-    playerBoard = BoardClass(userName)
+    playerBoard = BoardClass(userName, boardSize=BOARD_SIZE, winLength=WIN_LENGTH)
     
     while True:  
         try:
             establishConnection(s)
-            exchangeUsernames(s, playerBoard)
+            stream = MessageStream(s)
+            exchangeUsernames(stream, playerBoard)
             break
         except ValueError:
             print("Port must be an integer. Please try again.")
+        except RequestRefused as error:
+            # the server or lobby refused the board settings or user name and closed the connection, so a retry needs a new socket
+            print(f"Connection refused: {error}")
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if not retryConnection():
+                return
         except ConnectionError:
             # Triggers if valid host and port are given, but fails to make a connection, prompts for retry
             print("Connection failed.")
@@ -205,10 +235,15 @@ def main() -> None:
             if not retryConnection():
                 return
 
+    # stats carry over from the user's earlier games
+    statsStore = StatsStore()
+    playerBoard.setStats(*statsStore.loadStats(userName))
+
     beginGame(playerBoard)
-    playGames(playerBoard, s)
+    playGames(playerBoard, stream, statsStore)
+    statsStore.close()
     # Printing stats is last step before ending the program
-    playerBoard.printStats()
+    renderer.renderStats(playerBoard)
 
 
 if __name__ == "__main__":
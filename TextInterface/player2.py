@@ -1,8 +1,22 @@
 # SERVER
 from gameboard import InvalidMove
 from gameboard import BoardClass
+from gamelog import GameLog
+from minimax import MinimaxPlayer
+from mcts import MCTSPlayer
+from parallelsearch import ParallelSearchPlayer
+from protocol import MessageStream
+from protocol import ProtocolError
+from protocol import HELLO, MOVE, REMATCH, BYE, ACK, JOIN, ERROR
+from protocol import encodeHello, decodeHello, decodeMove, helloError
+from renderer import TextRenderer
+from statsstore import StatsStore
+import os
 import socket
 
+# Shows the game on the terminal; any object with the TextRenderer methods, such as a NullRenderer, can replace it.
+renderer = TextRenderer()
+
 def establishConnection(s: socket) -> socket:
     """Establishes a socket with a user input host and port, then waits for and accepts a connection on the socket.
 
@@ -26,40 +40,74 @@ def establishConnection(s: socket) -> socket:
     print("Waiting for connection...")
     conn, addr = s.accept()
     return conn
+
+def joinLobby(s: socket) -> socket:
+    """Connects to a lobby with a user input host and port, to be paired with a player1 that connects to the same lobby.
+
+    s: A socket type object that uses the user input host and port to connect to the lobby.
+
+    Returns:
+        s: socket type object representing the connection with the lobby, which relays player1's messages.
+    """
+    while True:
+        try:
+            host = input("Please enter the hostname or IP address of the lobby.\n").lower()
+            port = int(input("Please enter the port number that you want to connect through.\n"))
+            s.connect((host, port))
+            break
+        except ValueError:
+            print("Port must be an integer. Please try again.")
+        except Exception:
+            print("Invalid host or port, or the lobby could not be reached. Please try again.")
+
+    print("Waiting for the lobby to find a player 1...")
+    return s
     
-def exchangeUsernames(conn: socket, playerBoard: BoardClass) -> None:
-    """Receives player1's username over the socket, sets the otherPlayer attribute, then sends "player2" over the socket.
+def exchangeUsernames(stream: MessageStream, playerBoard: BoardClass) -> None:
+    """Receives player1's username and board settings, sets the otherPlayer attribute and board size, then sends "player2".
 
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
     playerBoard: BoardClass type object that stores all of the game information for player2.
+
+    A user name or board settings that cannot be played are refused with an ERROR message giving the reason, the connection
+    is closed, and a ProtocolError is raised.
     """
-    player1Name = conn.recv(1024).decode()
+    player1Name, boardSize, winLength = decodeHello(stream.expectMessage(HELLO))
+    refusal = helloError(player1Name, boardSize, winLength)
+
+    if refusal:
+        stream.sendMessage(ERROR, refusal.encode())
+        stream.close()
+        raise ProtocolError(refusal)
+
     playerBoard.setOtherPlayer(player1Name)
-    conn.sendall("player2".encode())
+    # player2 always plays on the board size chosen by player1
+    playerBoard.setBoardSize(boardSize, winLength)
+    stream.sendMessage(HELLO, encodeHello(playerBoard.getPlayerName(), boardSize, winLength))
 
 def beginGame(playerBoard: BoardClass) -> None:
     """Begins a game by outputing the game instructions and a fresh game board without moves.
 
     playerBoard: BoardClass type object that stores all of the game information for player2.
     """
-    playerBoard.printInstructions()
-    print("Start Game.")
-    playerBoard.printBoard()
+    renderer.renderStart(playerBoard)
 
-def takeTurn(playerBoard: BoardClass, conn: socket) -> None:
+def takeTurn(playerBoard: BoardClass, stream: MessageStream) -> None:
     """Plays out an entire turn for player2.
 
     playerBoard: BoardClass type object that stores all of the game information for player2.
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
 
     User inputs what move they want to make. If valid, the board is updated, printed out,
     and the move is sent to player1 over the socket.
     """
+    numTiles = playerBoard.getBoardSize() * playerBoard.getBoardSize()
+
     while True:
         try:
-            player2Move = int(input("Enter your move (number from 1 - 9): "))
+            player2Move = int(input(f"Enter your move (number from 1 - {numTiles}): "))
         
-            if not 1 <= player2Move <= 9:
+            if not 1 <= player2Move <= numTiles:
                 raise ValueError
 
             playerBoard.updateGameBoard(player2Move, "O")
@@ -71,48 +119,78 @@ def takeTurn(playerBoard: BoardClass, conn: socket) -> None:
             # Custom exception triggered when a game piece is already placed on input tile.
             print("That tile has already been played. Please try again.")
 
-    playerBoard.printBoard()
-    conn.sendall(str(player2Move).encode())
+    renderer.renderBoard(playerBoard)
+    stream.sendMessage(MOVE, bytes([player2Move]))
     # For this and future uses, upkeeps the lastPlayer attribute after a move is made.
     playerBoard.setLastPlayer(playerBoard.getPlayerName())
 
-def otherPlayerTurn(playerBoard: BoardClass, conn: socket) -> None:
+def computerTurn(playerBoard: BoardClass, stream: MessageStream, computerPlayer: object) -> None:
+    """Plays out an entire turn for player2 with the computer choosing the move.
+
+    playerBoard: BoardClass type object that stores all of the game information for player2.
+    stream: MessageStream type object representing the socket connection with player1.
+    computerPlayer: MinimaxPlayer, MCTSPlayer, or ParallelSearchPlayer type object that searches for player2's move.
+
+    The computer's move is placed on the board, printed out, and sent to player1 over the socket.
+    """
+    player2Move = computerPlayer.chooseMove(playerBoard, "O")
+    playerBoard.updateGameBoard(player2Move, "O")
+    renderer.renderBoard(playerBoard, f"The computer played tile {player2Move}.")
+    stream.sendMessage(MOVE, bytes([player2Move]))
+    playerBoard.setLastPlayer(playerBoard.getPlayerName())
+
+def otherPlayerTurn(playerBoard: BoardClass, stream: MessageStream) -> None:
     """Plays out an entire turn for player1.
 
     playerBoard: BoardClass type object that stores all of the game information for player2.
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
 
     Receives player1's move over the socket, updates gameboard with their move, outputs updated board.
     """
     # Output to terminal while waiting for player1 to make their move.
     print(f"{playerBoard.getOtherPlayer()}'s Turn...")
-    player1Move = int(conn.recv(1024).decode())
+    player1Move = decodeMove(stream.expectMessage(MOVE), playerBoard.getBoardSize())
     playerBoard.updateGameBoard(player1Move, "X")
-    playerBoard.printBoard()
+    renderer.renderBoard(playerBoard)
     playerBoard.setLastPlayer(playerBoard.getOtherPlayer())
 
-def determineBoardCondition(playerBoard: BoardClass, conn: socket) -> str:
+def determineBoardCondition(playerBoard: BoardClass, stream: MessageStream, statsStore: StatsStore = None, gameLog: GameLog = None) -> str:
     """Determines the condition of the board and how to respond.
 
     playerBoard: BoardClass type object that stores all of the game information for player2.
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
+    statsStore: StatsStore type object that player2's stats are saved to at the end of each game, or None.
+    gameLog: GameLog type object that each finished game is appended to, or None.
 
     If there is no winner or tie, play continues. If a game-ending event occurs, waits
     for input from player1 over the socket to determine if a new game should be played,
     or if the games should be ended.
     """
-    if playerBoard.isWinner("O") or playerBoard.boardIsFull():
-        print(f"Waiting for {playerBoard.getOtherPlayer()}...")
-        player1Response = conn.recv(1024).decode()
-
-        if player1Response == "Play Again":
-            return "New Game"
-        elif player1Response == "Fun Times":
-            return "End Game"
+    if playerBoard.isWinner("O"):
+        renderer.renderResult("O", playerBoard.getGameBoardTile(playerBoard.getLastTile()))
+    elif playerBoard.boardIsFull():
+        renderer.renderResult("O", "")
     else:
         # "Continue" is a filler return value when "New Game" and "End Game" do not apply
         return "Continue"
 
+    if statsStore is not None:
+        statsStore.saveStats(playerBoard.getPlayerName(), playerBoard)
+
+    if gameLog is not None:
+        # player1 plays X and player2 plays O
+        gameLog.appendGame(playerBoard, playerBoard.getOtherPlayer(), playerBoard.getPlayerName())
+
+    print(f"Waiting for {playerBoard.getOtherPlayer()}...")
+    player1Response = stream.recvMessage()[0]
+
+    if player1Response == REMATCH:
+        return "New Game"
+    elif player1Response == BYE:
+        return "End Game"
+    else:
+        raise ProtocolError(f"Expected a REMATCH or BYE message, received type {player1Response}.")
+
 def newGame(playerBoard: BoardClass) -> None:
     """Establishes a new game by clearing the gameboard and beginning a game.
 
@@ -121,28 +199,32 @@ def newGame(playerBoard: BoardClass) -> None:
     playerBoard.resetGameBoard()
     beginGame(playerBoard)
 
-def endGame(conn: socket) -> None:
+def endGame(stream: MessageStream) -> None:
     """Ends the game by closing the connection, notifies player1 over the connection before closing.
 
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
     """
     print("Closing connection.\n")
-    conn.sendall("Closing".encode())
-    conn.close()
+    stream.sendMessage(ACK)
+    stream.close()
 
-def playGames(playerBoard: BoardClass, conn: socket) -> None:
+def playGames(playerBoard: BoardClass, stream: MessageStream, computerPlayer: object = None, statsStore: StatsStore = None,
+              gameLog: GameLog = None) -> None:
     """Plays out a series of games until player1 decides to stop playing.
 
     playerBoard: BoardClass type object that stores all of the game information for player2.
-    conn: socket type object representing the socket connection with player1.
+    stream: MessageStream type object representing the socket connection with player1.
+    computerPlayer: MinimaxPlayer, MCTSPlayer, or ParallelSearchPlayer type object that takes player2's turns, or None if the user takes them.
+    statsStore: StatsStore type object that player2's stats are saved to at the end of each game, or None.
+    gameLog: GameLog type object that each finished game is appended to, or None.
 
     Loops through player1 taking their turn, checking if game-ending condition occurred,
     player2 taking their turn, then checking again if game-ending condition occurred. When a
     game-ending condition occurs, either starts a new game, or ends the game/program altogether.
     """
     while True:
-        otherPlayerTurn(playerBoard, conn)
-        boardCondition = determineBoardCondition(playerBoard, conn)
+        otherPlayerTurn(playerBoard, stream)
+        boardCondition = determineBoardCondition(playerBoard, stream, statsStore, gameLog)
 
         if boardCondition == "New Game":
             # New game is started, restarts loop so that player1 (the other player) has first turn.
@@ -150,37 +232,102 @@ def playGames(playerBoard: BoardClass, conn: socket) -> None:
             continue
         elif boardCondition == "End Game":
             # Games are fully ended by breaking out of this function loop.
-            endGame(conn)
+            endGame(stream)
             break
 
-        takeTurn(playerBoard, conn)
-        boardCondition = determineBoardCondition(playerBoard, conn)
+        if computerPlayer is None:
+            takeTurn(playerBoard, stream)
+        else:
+            computerTurn(playerBoard, stream, computerPlayer)
+        boardCondition = determineBoardCondition(playerBoard, stream, statsStore, gameLog)
 
         if boardCondition == "New Game":
             newGame(playerBoard)
         elif boardCondition == "End Game":
-            endGame(conn)
+            endGame(stream)
             break
 
+def useComputerPlayer() -> bool:
+    """Determines if the user wants the computer to take player2's turns, takes user input.
+
+    Returns:
+        True if user inputs y or Y for yes.
+        False if user inputs n or N for no.
+    """
+    useComputer = input("Do you want the computer to play as player 2? (y/n)\n").lower()
+
+    while useComputer != "y" and useComputer != "n":
+        useComputer = input("Invalid input. Please enter y or n.\n").lower()
+
+    return useComputer == "y"
+
+def useLobby() -> bool:
+    """Determines if the user wants to join a lobby instead of waiting for player1 to connect directly, takes user input.
+
+    Returns:
+        True if user inputs y or Y for yes.
+        False if user inputs n or N for no.
+    """
+    lobbyChoice = input("Do you want to join a lobby to be paired with player 1? (y/n)\n").lower()
+
+    while lobbyChoice != "y" and lobbyChoice != "n":
+        lobbyChoice = input("Invalid input. Please enter y or n.\n").lower()
+
+    return lobbyChoice == "y"
+
 def main() -> None:
     """Main function for running the program.
 
     A socket object is created, user inputs a username, a BoardClass object is created to hold
-    player2's information, a socket connection is established, games are played out, and in
-    the end final stats for player2 are printed out.
+    player2's information, the user chooses whether the computer plays, a socket connection is
+    established directly or through a lobby, games are played out, and in the end final stats for player2 are printed out.
     """
     # playerBoard becomes player2's BoardClass object
     playerBoard = BoardClass("player2")
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    useComputer = useComputerPlayer()
 
-    # conn must be used instead of the socket s, as the server
-    conn = establishConnection(s)
-    exchangeUsernames(conn, playerBoard)
+    if useLobby():
+        # the lobby relays every message once it pairs this player2 with a player1
+        stream = MessageStream(joinLobby(s))
+        stream.sendMessage(JOIN, playerBoard.getPlayerName().encode())
+    else:
+        # conn must be used instead of the socket s, as the server
+        conn = establishConnection(s)
+        stream = MessageStream(conn)
+
+    try:
+        exchangeUsernames(stream, playerBoard)
+    except ProtocolError as error:
+        print(f"Refused player 1's connection: {error}")
+        return
+
+    computerPlayer = None
+
+    if useComputer:
+        # exhaustive minimax only finishes on the standard board, so larger boards are searched within a time budget,
+        # across every core when there is more than one
+        if playerBoard.getBoardSize() == 3:
+            computerPlayer = MinimaxPlayer()
+        elif (os.cpu_count() or 1) > 1:
+            computerPlayer = ParallelSearchPlayer()
+        else:
+            computerPlayer = MCTSPlayer()
+    # stats carry over from player2's earlier games
+    statsStore = StatsStore()
+    playerBoard.setStats(*statsStore.loadStats(playerBoard.getPlayerName()))
+
+    gameLog = GameLog()
 
     beginGame(playerBoard)
-    playGames(playerBoard, conn)
+    playGames(playerBoard, stream, computerPlayer, statsStore, gameLog)
+    statsStore.close()
+    gameLog.close()
+
+    if isinstance(computerPlayer, ParallelSearchPlayer):
+        computerPlayer.close()
     # Printing stats is last step before ending the program
-    playerBoard.printStats()
+    renderer.renderStats(playerBoard)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+from gameboard import BoardClass
+import sys
+
+class TextRenderer:
+    """A renderer that shows the game on a terminal, building each frame in one string and writing it at once.
+
+    Every method makes a single write call, so a frame reaches the terminal in one piece, without the
+    flicker and system call of a print per line.
+
+    Attributes:
+        stream (TextIO): The text stream frames are written to, or None for the current sys.stdout.
+    """
+
+    def __init__(self, stream: object = None):
+        self.stream = stream
+
+    def write(self, frame: str) -> None:
+        """Write a whole frame with a single write call.
+
+        frame: The text of the frame.
+        """
+        (self.stream if self.stream is not None else sys.stdout).write(frame)
+
+    def boardLines(self, playerBoard: BoardClass, showTileNumbers: bool = False) -> list[str]:
+        """Build the lines of a boardSize x boardSize visual grid of the game board.
+
+        playerBoard: BoardClass type object holding the game board.
+        showTileNumbers: Determines if each tile shows its number (1 - boardSize squared) instead of its game piece.
+
+        Returns: The rows of the grid, with a divider line between each row.
+        """
+        boardSize = playerBoard.getBoardSize()
+        rowDivider = '-' * (4 * boardSize - 1)
+        lines = []
+
+        for i in range(boardSize):
+            tiles = range(i * boardSize + 1, (i + 1) * boardSize + 1)
+            lines.append('|'.join(f'{tile if showTileNumbers else playerBoard.getGameBoardTile(tile):^3}' for tile in tiles))
+            if i < boardSize - 1:
+                lines.append(rowDivider)
+
+        return lines
+
+    def renderStart(self, playerBoard: BoardClass) -> None:
+        """Show the instructions for which number corresponds to which tile, followed by the fresh game board.
+
+        playerBoard: BoardClass type object holding the game board.
+        """
+        numTiles = playerBoard.getBoardSize() * playerBoard.getBoardSize()
+        lines = [f"Moves are made with an integer from 1-{numTiles}, following the format of the grid below.",
+                 f"Align {playerBoard.getWinLength()} of your letter in a row, column, or diagonal to win."]
+        lines += self.boardLines(playerBoard, showTileNumbers=True)
+        lines += ["", "Start Game.", ""]
+        lines += self.boardLines(playerBoard)
+        self.write("\n".join(lines) + "\n\n")
+
+    def renderBoard(self, playerBoard: BoardClass, caption: str = "") -> None:
+        """Show the game board, with a blank line above and below it.
+
+        playerBoard: BoardClass type object holding the game board.
+        caption: A line shown above the board, such as the move just played, or an empty string for none.
+        """
+        lines = [caption] if caption else []
+        lines += [""] + self.boardLines(playerBoard)
+        self.write("\n".join(lines) + "\n\n")
+
+    def renderMove(self, playerBoard: BoardClass, gameLetter: str, tile: int) -> None:
+        """Show the game board after a move, captioned with the move.
+
+        playerBoard: BoardClass type object holding the game board.
+        gameLetter: The letter of the move, either X or O.
+        tile: The tile (1 - boardSize squared) of the move.
+        """
+        self.renderBoard(playerBoard, f"{gameLetter} played tile {tile}.")
+
+    def renderResult(self, playerLetter: str, winnerLetter: str) -> None:
+        """Show the result of a finished game for one player.
+
+        playerLetter: The letter that the player is using to play, either X or O.
+        winnerLetter: The letter of the winner, or an empty string for a tie.
+        """
+        if winnerLetter == "":
+            self.write("Tie!\n")
+        elif winnerLetter == playerLetter:
+            self.write("You won!\n")
+        else:
+            self.write("You lost...\n")
+
+    def renderStats(self, playerBoard: BoardClass) -> None:
+        """Show each of the game board's stats on a separate line.
+
+        playerBoard: BoardClass type object holding the player's stats.
+        """
+        self.write(f"Player's user name: {playerBoard.getPlayerName()}\n"
+                   f"Last player to make a move: {playerBoard.lastPlayer}\n"
+                   f"Number of games played: {playerBoard.numGames}\n"
+                   f"Number of wins: {playerBoard.numWins}\n"
+                   f"Number of losses: {playerBoard.numLosses}\n"
+                   f"Number of ties: {playerBoard.numTies}\n")
+
+class NullRenderer:
+    """A renderer that shows nothing, for headless runs such as self-play and archiving.
+
+    It has the same methods as TextRenderer, so either can be passed wherever a renderer is taken.
+    """
+
+    def renderStart(self, playerBoard: BoardClass) -> None:
+        pass
+
+    def renderBoard(self, playerBoard: BoardClass, caption: str = "") -> None:
+        pass
+
+    def renderMove(self, playerBoard: BoardClass, gameLetter: str, tile: int) -> None:
+        pass
+
+    def renderResult(self, playerLetter: str, winnerLetter: str) -> None:
+        pass
+
+    def renderStats(self, playerBoard: BoardClass) -> None:
+        pass
@@ -0,0 +1,246 @@
+from gameboard import BoardClass
+from minimax import MinimaxPlayer
+from mcts import MCTSPlayer
+from renderer import TextRenderer, NullRenderer
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+# Rollouts per move of an MCTS policy, a fixed budget instead of a time limit so that seeded runs repeat exactly.
+MCTS_ROLLOUTS = 1000
+
+class RandomPolicy:
+    """A computer player that chooses uniformly at random among the empty tiles.
+
+    Attributes:
+        rng (Random): Random type object used to choose moves, seeded for repeatable games.
+    """
+
+    def __init__(self, seed: int = None):
+        self.rng = random.Random(seed)
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Choose a random empty tile, matching the MinimaxPlayer chooseMove interface.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, either X or O.
+
+        Returns: The tile (1 - boardSize squared) of the chosen move.
+        """
+        numTiles = playerBoard.getBoardSize() * playerBoard.getBoardSize()
+        return self.rng.choice([tile for tile in range(1, numTiles + 1) if playerBoard.getGameBoardTile(tile) == ""])
+
+class ScriptedPolicy:
+    """A computer player that plays a fixed list of tiles in order, for repeatable regression games.
+
+    Tiles of the list that are already taken are skipped, and once the list runs out the first empty tile is played.
+
+    Attributes:
+        moves (list[int]): The tiles (1 - boardSize squared) to play, in order of preference.
+    """
+
+    def __init__(self, moves: list[int]):
+        self.moves = moves
+
+    def chooseMove(self, playerBoard: BoardClass, playerLetter: str) -> int:
+        """Choose the first scripted tile that is still empty, matching the MinimaxPlayer chooseMove interface.
+
+        playerBoard: BoardClass type object holding the position to move from. It is not modified.
+        playerLetter: The letter that the computer is playing as, either X or O.
+
+        Returns: The tile (1 - boardSize squared) of the chosen move.
+        """
+        for tile in self.moves:
+            if playerBoard.getGameBoardTile(tile) == "":
+                return tile
+
+        numTiles = playerBoard.getBoardSize() * playerBoard.getBoardSize()
+        return next(tile for tile in range(1, numTiles + 1) if playerBoard.getGameBoardTile(tile) == "")
+
+def playGame(playerBoard: BoardClass, xPolicy: object, oPolicy: object, renderer: object) -> None:
+    """Play out one game on an empty game board, with X moving first.
+
+    playerBoard: BoardClass type object kept from X's point of view, so X wins count as numWins and O wins as numLosses.
+    xPolicy: The player choosing X's moves, any object with a chooseMove(playerBoard, playerLetter) method.
+    oPolicy: The player choosing O's moves, any object with a chooseMove(playerBoard, playerLetter) method.
+    renderer: TextRenderer type object that shows every move, or NullRenderer type object to show nothing.
+    """
+    policy, letter = xPolicy, "X"
+
+    while True:
+        tile = policy.chooseMove(playerBoard, letter)
+        playerBoard.updateGameBoard(tile, letter)
+        renderer.renderMove(playerBoard, letter, tile)
+
+        # isWinner and boardIsFull record the result in the win, loss, and tie counters
+        if playerBoard.isWinner("X"):
+            renderer.renderResult("X", letter)
+            return
+        elif playerBoard.boardIsFull():
+            renderer.renderResult("X", "")
+            return
+
+        policy, letter = (oPolicy, "O") if letter == "X" else (xPolicy, "X")
+
+def runSelfPlay(xPolicy: object, oPolicy: object, numGames: int, boardSize: int = 3, winLength: int = 3, renderer: object = None) -> tuple[BoardClass, float]:
+    """Play numGames games between two policies, with no sockets or user input.
+
+    xPolicy: The player choosing X's moves, which moves first in every game.
+    oPolicy: The player choosing O's moves.
+    numGames: The number of games to play.
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same game piece that must be aligned to win.
+    renderer: TextRenderer type object that shows every move, or None to show nothing.
+
+    Returns: A tuple of the BoardClass type object holding X's numWins, numLosses, and numTies totals, and the
+    seconds taken to play the games.
+    """
+    playerBoard = BoardClass("X", otherPlayer="O", boardSize=boardSize, winLength=winLength)
+    renderer = renderer if renderer is not None else NullRenderer()
+    startTime = time.perf_counter()
+
+    for game in range(numGames):
+        playGame(playerBoard, xPolicy, oPolicy, renderer)
+        playerBoard.resetGameBoard()
+
+    return playerBoard, time.perf_counter() - startTime
+
+def createPolicy(name: str, seed: int, moves: list[int]) -> object:
+    """Create a policy by name for the command line.
+
+    name: One of "random", "minimax", "mcts", or "scripted".
+    seed: The seed of a random or MCTS policy.
+    moves: The tiles of a scripted policy.
+
+    Returns: The policy object.
+    """
+    if name == "random":
+        return RandomPolicy(seed)
+    elif name == "minimax":
+        return MinimaxPlayer()
+    elif name == "mcts":
+        return MCTSPlayer(timeLimit=None, maxRollouts=MCTS_ROLLOUTS, seed=seed)
+    else:
+        return ScriptedPolicy(moves)
+
+def playShard(shard: tuple[str, str, int, int, int, int, list[int], list[int]]) -> tuple[int, int, int]:
+    """Play one shard of games in a worker process, building the policies there so only names and seeds are sent.
+
+    shard: A tuple of the X and O policy names, the shard seed, the number of games, the board size, the win length,
+    and the tiles of scripted X and O policies.
+
+    Returns: A tuple of the X wins, O wins, and ties of the shard, instead of a result for every game.
+    """
+    xName, oName, seed, numGames, boardSize, winLength, xMoves, oMoves = shard
+    # X and O get different seeds, so two random policies do not mirror each other
+    xPolicy = createPolicy(xName, seed * 2, xMoves)
+    oPolicy = createPolicy(oName, seed * 2 + 1, oMoves)
+    playerBoard = runSelfPlay(xPolicy, oPolicy, numGames, boardSize, winLength)[0]
+    return playerBoard.numWins, playerBoard.numLosses, playerBoard.numTies
+
+def runParallelSelfPlay(xName: str, oName: str, numGames: int, numWorkers: int = None, seed: int = None, boardSize: int = 3, winLength: int = 3,
+                        xMoves: list[int] = None, oMoves: list[int] = None) -> tuple[BoardClass, float]:
+    """Play numGames games between two named policies across a pool of worker processes.
+
+    The games are split into shards, a few per worker so that slow shards do not leave workers idle, and every
+    shard gets its own seed. Each worker returns only the win, loss, and tie totals of a shard, which are merged
+    into one BoardClass.
+
+    xName: The name of the policy playing X, as accepted by createPolicy.
+    oName: The name of the policy playing O.
+    numGames: The number of games to play.
+    numWorkers: The number of worker processes, one per core if None.
+    seed: The seed that the shard seeds are derived from, a random one if None.
+    boardSize: The number of rows and columns on the board.
+    winLength: The number of the same game piece that must be aligned to win.
+    xMoves: The tiles of a scripted X policy.
+    oMoves: The tiles of a scripted O policy.
+
+    Returns: A tuple of the BoardClass type object holding X's merged numWins, numLosses, and numTies totals, and the
+    seconds taken to play the games.
+    """
+    numWorkers = numWorkers or os.cpu_count()
+    numShards = max(min(numGames, numWorkers * 4), 1)
+    baseSeed = seed if seed is not None else random.randrange(2 ** 32)
+    shards = []
+
+    for shardIndex in range(numShards):
+        # spreads the remainder over the first shards, so shard sizes differ by at most 1 game
+        shardGames = numGames // numShards + (1 if shardIndex < numGames % numShards else 0)
+        shards.append((xName, oName, baseSeed * numShards + shardIndex, shardGames, boardSize, winLength, xMoves or [], oMoves or []))
+
+    playerBoard = BoardClass("X", otherPlayer="O", boardSize=boardSize, winLength=winLength)
+    startTime = time.perf_counter()
+
+    with multiprocessing.Pool(numWorkers) as pool:
+        for numWins, numLosses, numTies in pool.imap_unordered(playShard, shards):
+            playerBoard.numWins += numWins
+            playerBoard.numLosses += numLosses
+            playerBoard.numTies += numTies
+
+    playerBoard.numGames = playerBoard.numWins + playerBoard.numLosses + playerBoard.numTies
+    return playerBoard, time.perf_counter() - startTime
+
+def parseMoves(text: str) -> list[int]:
+    """Parse a comma separated list of tiles, such as "5,1,9", for a scripted policy.
+
+    Returns: The list of tiles.
+    """
+    return [int(tile) for tile in text.split(",") if tile.strip()]
+
+def printResults(args: argparse.Namespace, playerBoard: BoardClass, elapsed: float) -> None:
+    """Print the win, loss, and tie totals of a run and its throughput in games per second.
+
+    args: The parsed command line arguments of the run.
+    playerBoard: BoardClass type object holding X's totals.
+    elapsed: The seconds taken to play the games.
+    """
+    print(f"X ({args.x_policy}) wins: {playerBoard.numWins}")
+    print(f"O ({args.o_policy}) wins: {playerBoard.numLosses}")
+    print(f"Ties: {playerBoard.numTies}")
+    print(f"Played {args.games} games in {elapsed:.2f} seconds ({args.games / max(elapsed, 1e-9):.0f} games per second).")
+
+def main() -> None:
+    """Main function for running the program.
+
+    Reads the policies and number of games from the command line, plays the games, then prints the
+    results and throughput in games per second.
+    """
+    policyNames = ("random", "minimax", "mcts", "scripted")
+    parser = argparse.ArgumentParser(description="Play tic-tac-toe games between two computer policies, with no sockets or user input.")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("-x", "--x-policy", choices=policyNames, default="random", help="policy playing X, which moves first")
+    parser.add_argument("-o", "--o-policy", choices=policyNames, default="random", help="policy playing O")
+    parser.add_argument("--x-moves", type=parseMoves, default=[], help="tiles played by a scripted X, such as 5,1,9")
+    parser.add_argument("--o-moves", type=parseMoves, default=[], help="tiles played by a scripted O")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random policies")
+    parser.add_argument("--size", type=int, default=3, help="number of rows and columns on the board")
+    parser.add_argument("--win-length", type=int, default=3, help="number of the same piece that must be aligned to win")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="number of worker processes, 0 for one per core")
+    parser.add_argument("--show", action="store_true", help="show every move of every game, which slows down the run; only with -j 1")
+    args = parser.parse_args()
+
+    if args.show and args.workers != 1:
+        # the worker processes return only totals, so there are no moves to show
+        parser.error("--show needs a single worker (-j 1)")
+
+    if args.workers != 1:
+        playerBoard, elapsed = runParallelSelfPlay(args.x_policy, args.o_policy, args.games, args.workers or None, args.seed,
+                                                   args.size, args.win_length, args.x_moves, args.o_moves)
+        printResults(args, playerBoard, elapsed)
+        return
+
+    # X and O get different seeds, so two random policies do not mirror each other
+    xSeed = None if args.seed is None else args.seed * 2
+    oSeed = None if args.seed is None else args.seed * 2 + 1
+    xPolicy = createPolicy(args.x_policy, xSeed, args.x_moves)
+    oPolicy = createPolicy(args.o_policy, oSeed, args.o_moves)
+
+    playerBoard, elapsed = runSelfPlay(xPolicy, oPolicy, args.games, args.size, args.win_length, TextRenderer() if args.show else None)
+    printResults(args, playerBoard, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import sys
+
+# Default location of the stats database, next to this file.
+DEFAULT_STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "playerstats.db")
+
+class StatsStore:
+    """A class that keeps player statistics in a SQLite database, so they last across games and programs.
+
+    The database runs in WAL mode, so a leaderboard can be read while games are being saved. Stats are
+    keyed by user name, and a leaderboard index on the win totals keeps the top players a short index
+    scan away, however many players there are. A save adds only the games played since the player's
+    last load or save to the stored totals, in one upsert, so sessions of the same user name running at
+    once (such as several player2s in a lobby) each add their own games instead of overwriting each other.
+
+    Attributes:
+        path (str): File path of the database.
+        connection (Connection): sqlite3 Connection type object of the open database.
+        savedStats (dict[str, tuple[int, int, int, int]]): The numWins, numTies, numLosses, and numGames of each player
+            as of its last load or save, which the next save's new games are counted from.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_PATH):
+        self.path = path
+        self.savedStats = {}
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # WAL mode stays consistent after a crash with NORMAL syncing, which skips an fsync per transaction
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS playerStats (
+                    userName TEXT PRIMARY KEY,
+                    numWins INTEGER NOT NULL,
+                    numTies INTEGER NOT NULL,
+                    numLosses INTEGER NOT NULL,
+                    numGames INTEGER NOT NULL,
+                    lastPlayer TEXT NOT NULL
+                )""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS leaderboardIndex ON playerStats (numWins DESC, userName)")
+
+    def loadStats(self, userName: str) -> tuple[int, int, int, int]:
+        """Look up the saved stats of a player, which later saves of the player count their new games from.
+
+        userName: The user name of the player.
+
+        Returns: A tuple of numWins, numTies, numLosses, and numGames, all 0 for a new player.
+        """
+        row = self.connection.execute("SELECT numWins, numTies, numLosses, numGames FROM playerStats WHERE userName = ?", (userName,)).fetchone()
+        self.savedStats[userName] = row if row is not None else (0, 0, 0, 0)
+        return self.savedStats[userName]
+
+    def saveStats(self, userName: str, playerBoard: object) -> None:
+        """Add the games a player finished since its last load or save to its stored stats, in one transaction.
+
+        userName: The user name of the player, whose stats playerBoard holds.
+        playerBoard: BoardClass type object holding the player's numWins, numTies, numLosses, numGames, and lastPlayer.
+        """
+        totals = (playerBoard.numWins, playerBoard.numTies, playerBoard.numLosses, playerBoard.numGames)
+        # a player that was never loaded started from no games
+        newGames = tuple(total - saved for total, saved in zip(totals, self.savedStats.get(userName, (0, 0, 0, 0))))
+
+        with self.connection:
+            self.connection.execute("""
+                INSERT INTO playerStats (userName, numWins, numTies, numLosses, numGames, lastPlayer) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (userName) DO UPDATE SET
+                    numWins = numWins + excluded.numWins, numTies = numTies + excluded.numTies,
+                    numLosses = numLosses + excluded.numLosses, numGames = numGames + excluded.numGames,
+                    lastPlayer = excluded.lastPlayer""",
+                (userName,) + newGames + (playerBoard.lastPlayer,))
+
+        self.savedStats[userName] = totals
+
+    def leaderboard(self, limit: int = 10) -> list[tuple[str, int, int, int, int]]:
+        """Find the players with the most wins, read in order from the leaderboard index.
+
+        limit: The number of players to return.
+
+        Returns: A list of (userName, numWins, numTies, numLosses, numGames) tuples, most wins first.
+        """
+        return self.connection.execute("""
+            SELECT userName, numWins, numTies, numLosses, numGames FROM playerStats
+            ORDER BY numWins DESC, userName LIMIT ?""", (limit,)).fetchall()
+
+    def close(self) -> None:
+        """Close the database.
+        """
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    statsStore = StatsStore(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATS_PATH)
+
+    for rank, (userName, numWins, numTies, numLosses, numGames) in enumerate(statsStore.leaderboard(), 1):
+        print(f"{rank}. {userName}: {numWins} wins, {numLosses} losses, {numTies} ties in {numGames} games")
+
+    statsStore.close()
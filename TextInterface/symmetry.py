@@ -0,0 +1,98 @@
+from gameboard import BoardClass
+
+# Cache of the 8 board permutations for each board size, as they only depend on the size.
+_permutationCache = {}
+
+def symmetryPermutations(boardSize: int) -> list[tuple[int, ...]]:
+    """Build the 8 rotations and reflections (the D4 group) of a square board as index permutations.
+
+    boardSize: The number of rows and columns on the board.
+
+    Returns: A list of 8 tuples, where transformed[index] = cells[permutation[index]]. The first
+    permutation is the identity.
+    """
+    if boardSize not in _permutationCache:
+        last = boardSize - 1
+        # maps a transformed (row, column) back to the (row, column) it is read from
+        transforms = (
+            lambda row, col: (row, col),
+            lambda row, col: (last - col, row),
+            lambda row, col: (last - row, last - col),
+            lambda row, col: (col, last - row),
+            lambda row, col: (row, last - col),
+            lambda row, col: (last - row, col),
+            lambda row, col: (col, row),
+            lambda row, col: (last - col, last - row)
+        )
+        permutations = []
+
+        for transform in transforms:
+            permutation = []
+            for index in range(boardSize * boardSize):
+                row, col = transform(*divmod(index, boardSize))
+                permutation.append(row * boardSize + col)
+            permutations.append(tuple(permutation))
+
+        _permutationCache[boardSize] = permutations
+
+    return _permutationCache[boardSize]
+
+def canonicalKey(cells: list[int], boardSize: int) -> tuple[int, int]:
+    """Fold a position to the smallest base 3 hash among its 8 rotations and reflections.
+
+    cells: Flat list of the board tiles, 0 for an empty tile, 1 for X, and 2 for O.
+    boardSize: The number of rows and columns on the board.
+
+    Returns: A tuple of the canonical key, which is the same for all 8 symmetric positions, and the index
+    of the permutation that transforms cells into the canonical position.
+    """
+    bestKey = None
+    bestTransform = 0
+
+    for transformIndex, permutation in enumerate(symmetryPermutations(boardSize)):
+        key = 0
+        for index in reversed(permutation):
+            key = key * 3 + cells[index]
+
+        if bestKey is None or key < bestKey:
+            bestKey = key
+            bestTransform = transformIndex
+
+    return bestKey, bestTransform
+
+def boardCanonicalKey(playerBoard: BoardClass) -> tuple[int, int]:
+    """Compute the canonical key of a BoardClass game board, see canonicalKey.
+
+    playerBoard: BoardClass type object holding the position.
+
+    Returns: A tuple of the canonical key and the index of the transform to the canonical position.
+    """
+    cells = []
+
+    for tile in range(1, playerBoard.getBoardSize() * playerBoard.getBoardSize() + 1):
+        letter = playerBoard.getGameBoardTile(tile)
+        cells.append(1 if letter == "X" else 2 if letter == "O" else 0)
+
+    return canonicalKey(cells, playerBoard.getBoardSize())
+
+def originalTile(canonicalTile: int, transformIndex: int, boardSize: int) -> int:
+    """Map a tile on the canonical position back to the same tile on the original position.
+
+    canonicalTile: A tile (1 - boardSize squared) of the canonical position, such as a cached best move.
+    transformIndex: The transform index returned with the canonical key of the original position.
+    boardSize: The number of rows and columns on the board.
+
+    Returns: The tile (1 - boardSize squared) of the original position.
+    """
+    return symmetryPermutations(boardSize)[transformIndex][canonicalTile - 1] + 1
+
+def canonicalTile(tile: int, transformIndex: int, boardSize: int) -> int:
+    """Map a tile on the original position to the same tile on the canonical position, the inverse of originalTile.
+
+    tile: A tile (1 - boardSize squared) of the original position.
+    transformIndex: The transform index returned with the canonical key of the original position.
+    boardSize: The number of rows and columns on the board.
+
+    Returns: The tile (1 - boardSize squared) of the canonical position.
+    """
+    return symmetryPermutations(boardSize)[transformIndex].index(tile - 1) + 1
@@ -0,0 +1,92 @@
+from protocol import MessageStream
+from protocol import ProtocolError
+from protocol import HELLO, MOVE, REMATCH, BYE
+from protocol import encodeMessage, encodeHello, decodeHello, decodeMove
+import socket
+import threading
+import time
+import unittest
+
+class MessageStreamTest(unittest.TestCase):
+    """Tests that MessageStream receives whole messages however TCP splits or merges their bytes.
+    """
+
+    def setUp(self):
+        self.sender, receiver = socket.socketpair()
+        self.stream = MessageStream(receiver)
+
+    def tearDown(self):
+        self.sender.close()
+        self.stream.close()
+
+    def sendInChunks(self, data: bytes) -> threading.Thread:
+        """Send data one byte per send call from another thread, pausing between bytes so each arrives in its own read.
+
+        Returns: The sending thread, already started.
+        """
+        def sendBytes():
+            for index in range(len(data)):
+                self.sender.sendall(data[index:index + 1])
+                time.sleep(0.001)
+
+        sender = threading.Thread(target=sendBytes)
+        sender.start()
+        return sender
+
+    def testMessagesSplitIntoSingleBytes(self):
+        data = encodeMessage(HELLO, encodeHello("alice", 15, 5)) + encodeMessage(MOVE, bytes([113])) + encodeMessage(REMATCH)
+        sender = self.sendInChunks(data)
+
+        self.assertEqual(decodeHello(self.stream.expectMessage(HELLO)), ("alice", 15, 5))
+        self.assertEqual(self.stream.recvMessage(), (MOVE, bytes([113])))
+        self.assertEqual(self.stream.recvMessage(), (REMATCH, b""))
+        sender.join()
+        self.assertEqual(self.stream.buffer, b"")
+
+    def testMessagesMergedIntoOneBurst(self):
+        moves = [1, 5, 9, 2, 8]
+        self.sender.sendall(b"".join(encodeMessage(MOVE, bytes([tile])) for tile in moves) + encodeMessage(BYE))
+
+        for tile in moves:
+            self.assertEqual(self.stream.expectMessage(MOVE), bytes([tile]))
+        self.assertEqual(self.stream.recvMessage(), (BYE, b""))
+        self.assertEqual(self.stream.buffer, b"")
+
+    def testBurstEndingInPartialMessage(self):
+        second = encodeMessage(HELLO, encodeHello("bob", 3, 3))
+        self.sender.sendall(encodeMessage(MOVE, bytes([7])) + second[:4])
+
+        self.assertEqual(self.stream.recvMessage(), (MOVE, bytes([7])))
+        sender = self.sendInChunks(second[4:])
+        self.assertEqual(decodeHello(self.stream.expectMessage(HELLO)), ("bob", 3, 3))
+        sender.join()
+
+    def testUnexpectedMessageType(self):
+        self.sender.sendall(encodeMessage(BYE))
+
+        with self.assertRaises(ProtocolError):
+            self.stream.expectMessage(MOVE)
+
+    def testConnectionClosedMidMessage(self):
+        self.sender.sendall(encodeMessage(MOVE, bytes([3]))[:2])
+        self.sender.close()
+
+        with self.assertRaises(ConnectionError):
+            self.stream.recvMessage()
+
+class DecodeMoveTest(unittest.TestCase):
+    """Tests that a MOVE payload is only accepted as one tile of the board.
+    """
+
+    def testTilesOfTheBoard(self):
+        self.assertEqual(decodeMove(bytes([1]), 3), 1)
+        self.assertEqual(decodeMove(bytes([225]), 15), 225)
+
+    def testInvalidPayloads(self):
+        for payload in (b"", bytes([0]), bytes([10]), bytes([4, 5])):
+            with self.assertRaises(ProtocolError):
+                decodeMove(payload, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
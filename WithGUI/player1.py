@@ -1,19 +1,49 @@
 from gameboard import BoardClass
+from protocol import MessageStream
+from protocol import RequestRefused
+from protocol import HELLO, MOVE, REMATCH, BYE, ACK
+from protocol import encodeHello, decodeHello
+from statsstore import StatsStore
+from functools import partial
+import queue
 import socket
+import threading
 import tkinter as tk
 
+# Width in characters of each tile, and of the black borders between tiles.
+TILE_WIDTH = 15
+BORDER_WIDTH = 2
+# Window pixels taken up by each tile and its border, and by the player turn label above the board.
+TILE_PIXELS = 126
+TURN_LABEL_PIXELS = 72
+# Board size and win length of the games played, which player2 takes from player1's HELLO message.
+BOARD_SIZE = 3
+WIN_LENGTH = 3
+
+# Milliseconds between checks of the queue of messages received from player2.
+POLL_INTERVAL = 20
+
 class player1UI():
     """A class that handles and processes the GUI aspects of the Tic-Tac-Toe game, for player1, using TKinter elements.
 
     Attributes:
         userName (str): The username string for player1, alphanumeric only.
         s (socket): Socket type object that handles the GUI's socket connections.
+        stream (MessageStream): MessageStream type object that sends and receives framed messages over the socket.
         host (str): The host name or IP address of the intended device to connect to.
         port (int): The port number used to connect to the host.
         setupWindow (TK): Window used to host widgets for establishing username and socket connection information.
         root (TK): Main window used to display the Tic-Tac-Toe game.
         playerBoard (BoardClass): BoardClass type object that stores and processes all of the internal game information.
+        statsStore (StatsStore): StatsStore type object that player1's stats are loaded from and saved to at the end of each game.
+        tileValues (list[StringVar]): The displayed letter of each tile, indexed by tile number - 1.
+        tileButtons (list[Button]): The button that plays each tile, indexed by tile number - 1.
+        gridColumns (int): The number of grid columns that the board spans, tiles and borders included.
+        boardWidth (int): The width in characters of the board, used for the labels that span it.
         canMove (bool): Determines if player1 can make a move, true if it is player1's turn.
+        pendingChanges (dict): Widget and variable changes waiting for the next render, keyed by the id of what they change.
+        renderScheduled (bool): Determines if a render is already scheduled for the next time the window is idle.
+        messageQueue (Queue): Messages received from player2 by the reader thread, waiting to be handled on the Tk main thread.
     """
     
     def __init__(self):
@@ -49,6 +79,8 @@ class player1UI():
         self.portIntErrorLabel = tk.Label(self.setupWindow, text="Port must be an integer. Please try again.", width=60, height=3)
         self.connErrorLabel = tk.Label(self.setupWindow, text="Connection failed. Try again?", width=60, height=3)
         self.invalidErrorLabel = tk.Label(self.setupWindow, text="Invalid host or port. Try again?", width=60, height=3)
+        # shows the reason sent by a server or lobby that refused the connection
+        self.refusedErrorLabel = tk.Label(self.setupWindow, width=60, height=3)
         self.yesButton = tk.Button(self.setupWindow, text="Y", width=10, height=2, bg="green", command=self.retryConnection)
         self.noButton = tk.Button(self.setupWindow, text="N", width=10, height=2, bg="red", command=self.setupWindow.destroy)
         
@@ -82,10 +114,19 @@ class player1UI():
         try:
             portInt = int(self.port.get())
             self.s.connect((self.host.get(), portInt))
+            self.stream = MessageStream(self.s)
             self.exchangeUsernames()
         except tk.TclError:
             # tk.TclError is raised in place of a ValueError
             self.portIntErrorLabel.grid(row=5)
+        except RequestRefused as error:
+            # the server or lobby refused the board settings or user name and closed the connection, so a retry needs a new socket
+            self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.refusedErrorLabel.configure(text=f"Connection refused: {error} Try again?")
+            self.refusedErrorLabel.grid(row=5)
+            self.hostPortButton.grid_forget()
+            self.yesButton.grid(row=6)
+            self.noButton.grid(row=7)
         except ConnectionError:
             # valid input, but a connection was not made
             self.connErrorLabel.grid(row=5)
@@ -107,6 +148,7 @@ class player1UI():
         self.hostPortButton.grid(row=4)
         self.connErrorLabel.grid_forget()
         self.invalidErrorLabel.grid_forget()
+        self.refusedErrorLabel.grid_forget()
         self.portIntErrorLabel.grid_forget()
         self.yesButton.grid_forget()
         self.noButton.grid_forget()
@@ -114,9 +156,12 @@ class player1UI():
     def exchangeUsernames(self) -> None:
         """Send userName, receive player2's username, create BoardClass type playerBoard, and intialize game.
         """
-        self.s.sendall(self.userName.get().encode())
-        player2Name = self.s.recv(1024).decode()
-        self.playerBoard = BoardClass(self.userName.get(), player2Name)
+        self.stream.sendMessage(HELLO, encodeHello(self.userName.get(), BOARD_SIZE, WIN_LENGTH))
+        player2Name, boardSize, winLength = decodeHello(self.stream.expectMessage(HELLO))
+        self.playerBoard = BoardClass(self.userName.get(), player2Name, boardSize=BOARD_SIZE, winLength=WIN_LENGTH)
+        # stats carry over from player1's earlier games
+        self.statsStore = StatsStore()
+        self.playerBoard.setStats(*self.statsStore.loadStats(self.userName.get()))
         self.createGameWindow()
         
     def createGameWindow(self) -> None:
@@ -125,7 +170,8 @@ class player1UI():
         self.setupWindow.destroy()
         self.root = tk.Tk()
         self.root.title("Tic-Tac-Toe (Player 1)")
-        self.root.geometry('378x450+100+50')
+        boardPixels = TILE_PIXELS * self.playerBoard.getBoardSize()
+        self.root.geometry(f'{boardPixels}x{boardPixels + TURN_LABEL_PIXELS}+100+50')
         self.root.configure(background='black')
         self.root.resizable(0, 0)
         self.setupGame()
@@ -133,77 +179,60 @@ class player1UI():
     def createTileVariables(self) -> None:
         """Intialize variables to store the values of each gameboard tile.
         """
-        self.tile1Value = tk.StringVar()
-        self.tile2Value = tk.StringVar()
-        self.tile3Value = tk.StringVar()
-        self.tile4Value = tk.StringVar()
-        self.tile5Value = tk.StringVar()
-        self.tile6Value = tk.StringVar()
-        self.tile7Value = tk.StringVar()
-        self.tile8Value = tk.StringVar()
-        self.tile9Value = tk.StringVar()
+        numTiles = self.playerBoard.getBoardSize() * self.playerBoard.getBoardSize()
+        self.tileValues = [tk.StringVar() for tile in range(numTiles)]
+
+    def tileGridPosition(self, tile: int) -> tuple[int, int]:
+        """Find where a tile is placed in the window grid, leaving a row and column for borders between tiles.
+
+        tile: The tile number (1 - boardSize squared).
+
+        Returns: A tuple of the grid row and grid column of the tile.
+        """
+        row, column = divmod(tile - 1, self.playerBoard.getBoardSize())
+        return 2 * row + 1, 2 * column
 
     def addBoardBorders(self) -> None:
         """Add black borders within the window for visual separation of gameboard tiles.
         """
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=1, column=1)
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=1, column=3)
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=3, column=1)
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=3, column=3)
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=5, column=1)
-        tk.Label(self.root, bg="black", width=2, height=5).grid(row=5, column=3)
-        tk.Label(self.root, bg="black", width=50, height=1).grid(row=2, columnspan=5)
-        tk.Label(self.root, bg="black", width=50, height=1).grid(row=4, columnspan=5)
+        boardSize = self.playerBoard.getBoardSize()
+
+        for row in range(boardSize):
+            for column in range(boardSize - 1):
+                tk.Label(self.root, bg="black", width=BORDER_WIDTH, height=5).grid(row=2 * row + 1, column=2 * column + 1)
+
+        for row in range(boardSize - 1):
+            tk.Label(self.root, bg="black", width=self.boardWidth + 1, height=1).grid(row=2 * row + 2, columnspan=self.gridColumns)
 
     def setupBoard(self) -> None:
-        """Setup the visual gameboard by creating a label and button for each of the 9 tiles on the board.
+        """Setup the visual gameboard by creating a label and button for each tile on the board.
         """
-        # Tile 1
-        self.tile1Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile1Value).grid(row=1, column=0)
-        self.tile1Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileOne)
-        self.tile1Button.grid(row=1, column=0)
-        # Tile 2
-        self.tile2Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile2Value).grid(row=1, column=2)
-        self.tile2Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileTwo)
-        self.tile2Button.grid(row=1, column=2)
-        # Tile 3
-        self.tile3Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile3Value).grid(row=1, column=4)
-        self.tile3Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileThree)
-        self.tile3Button.grid(row=1, column=4)
-        # Tile 4
-        self.tile4Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile4Value).grid(row=3, column=0)
-        self.tile4Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileFour)
-        self.tile4Button.grid(row=3, column=0)
-        # Tile 5
-        self.tile5Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile5Value).grid(row=3, column=2)
-        self.tile5Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileFive)
-        self.tile5Button.grid(row=3, column=2)
-        # Tile 6
-        self.tile6Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile6Value).grid(row=3, column=4)
-        self.tile6Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileSix)
-        self.tile6Button.grid(row=3, column=4)
-        # Tile 7
-        self.tile7Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile7Value).grid(row=5, column=0)
-        self.tile7Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileSeven)
-        self.tile7Button.grid(row=5, column=0)
-        # Tile 8
-        self.tile8Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile8Value).grid(row=5, column=2)
-        self.tile8Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileEight)
-        self.tile8Button.grid(row=5, column=2)
-        # Tile 9
-        self.tile9Label = tk.Label(self.root, width=15, height=5, textvariable = self.tile9Value).grid(row=5, column=4)
-        self.tile9Button = tk.Button(self.root, width=15, height=5, bd=0, command=self.playTileNine)
-        self.tile9Button.grid(row=5, column=4)
+        self.tileButtons = []
+
+        for tile in range(1, len(self.tileValues) + 1):
+            row, column = self.tileGridPosition(tile)
+            tk.Label(self.root, width=TILE_WIDTH, height=5, textvariable = self.tileValues[tile - 1]).grid(row=row, column=column)
+            # the default argument binds each button to its own tile number
+            tileButton = tk.Button(self.root, width=TILE_WIDTH, height=5, bd=0, command=lambda tile=tile: self.playTile(tile))
+            tileButton.grid(row=row, column=column)
+            self.tileButtons.append(tileButton)
 
         self.addBoardBorders()
 
     def setupGame(self) -> None:
         """Setup the game by adding playerTurnLabel, initializing variables and gameboard, then starting mainloop.
         """
+        boardSize = self.playerBoard.getBoardSize()
+        self.gridColumns = 2 * boardSize - 1
+        self.boardWidth = boardSize * TILE_WIDTH + (boardSize - 1) * BORDER_WIDTH
+
         # display of the current player's turn at the top of the game screen
         self.playerTurn = tk.StringVar()
         self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.playerTurnLabel = tk.Label(self.root, textvariable = self.playerTurn, bg="orange", width=49, height=3).grid(row=0, column=0, columnspan=5)
+        self.playerTurnLabel = tk.Label(self.root, textvariable = self.playerTurn, bg="orange", width=self.boardWidth, height=3).grid(row=0, column=0, columnspan=self.gridColumns)
+
+        self.pendingChanges = {}
+        self.renderScheduled = False
 
         # creation of visual board and setting canMove attribute
         self.createTileVariables()
@@ -211,375 +240,171 @@ class player1UI():
         self.canMove = True
 
         # creating widgets for player1 to later indicate whether to play another game
-        self.playAgainLabel = tk.Label(self.root, width=19, height=3, bg="purple", text="Play Again?")
+        self.playAgainLabel = tk.Label(self.root, width=self.boardWidth - 2 * TILE_WIDTH, height=3, bg="purple", text="Play Again?")
         self.yesButton = tk.Button(self.root, width=15, height=3, bd=0, text="Y", bg="green", command=self.newGame)
         self.noButton = tk.Button(self.root, width=15, height=3, bd=0, text="N", bg="red", command=self.endGame)
 
+        self.startReceiving()
         self.root.mainloop()
 
-    def playTileOne(self, event = None) -> None:
-        """Play out a player1 turn on tile one if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile1Button
-
-        Updates the gameboard with an X on tile one, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(1, "X")
-            self.tile1Value.set(self.playerBoard.getGameBoardTile(1))
-            self.tile1Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("1".encode())
-            self.checkBoardCondition()
-
-    def playTileTwo(self, event = None) -> None:
-        """Play out a player1 turn on tile two if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile2Button
-
-        Updates the gameboard with an X on tile two, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(2, "X")
-            self.tile2Value.set(self.playerBoard.getGameBoardTile(2))
-            self.tile2Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("2".encode())
-            self.checkBoardCondition()
-
-    def playTileThree(self, event = None) -> None:
-        """Play out a player1 turn on tile three if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile3Button
-
-        Updates the gameboard with an X on tile three, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(3, "X")
-            self.tile3Value.set(self.playerBoard.getGameBoardTile(3))
-            self.tile3Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("3".encode())
-            self.checkBoardCondition()
-
-    def playTileFour(self, event = None) -> None:
-        """Play out a player1 turn on tile four if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile4Button
-
-        Updates the gameboard with an X on tile four, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(4, "X")
-            self.tile4Value.set(self.playerBoard.getGameBoardTile(4))
-            self.tile4Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("4".encode())
-            self.checkBoardCondition()
-
-    def playTileFive(self, event = None) -> None:
-        """Play out a player1 turn on tile five if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile5Button
-
-        Updates the gameboard with an X on tile five, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(5, "X")
-            self.tile5Value.set(self.playerBoard.getGameBoardTile(5))
-            self.tile5Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("5".encode())
-            self.checkBoardCondition()
-
-    def playTileSix(self, event = None) -> None:
-        """Play out a player1 turn on tile six if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile6Button
-
-        Updates the gameboard with an X on tile six, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(6, "X")
-            self.tile6Value.set(self.playerBoard.getGameBoardTile(6))
-            self.tile6Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("6".encode())
-            self.checkBoardCondition()
-
-    def playTileSeven(self, event = None) -> None:
-        """Play out a player1 turn on tile seven if player1 is allowed to make a move.
+    def playTile(self, tile: int) -> None:
+        """Play out a player1 turn on a tile if player1 is allowed to make a move.
 
-        Event: triggered by clicking on tile7Button
+        tile: The tile number (1 - boardSize squared), triggered by clicking on that tile's button
 
-        Updates the gameboard with an X on tile seven, switches turns, sends the move to player2, and
+        Updates the gameboard with an X on the tile, switches turns, sends the move to player2, and
         finally runs a check if the game has ended upon completion of the turn.
         """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(7, "X")
-            self.tile7Value.set(self.playerBoard.getGameBoardTile(7))
-            self.tile7Button.grid_forget()
+        # the button of a played tile is only removed at the next render, so a click queued before then is ignored here
+        if self.canMove and self.playerBoard.getGameBoardTile(tile) == "":
+            self.playerBoard.updateGameBoard(tile, "X")
+            self.scheduleChange(self.tileValues[tile - 1], self.tileValues[tile - 1].set, self.playerBoard.getGameBoardTile(tile))
+            self.scheduleChange(self.tileButtons[tile - 1], self.tileButtons[tile - 1].grid_forget)
             self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("7".encode())
+            self.scheduleChange(self.playerTurn, self.playerTurn.set, f"{self.playerBoard.getPlayer2Name()}'s Turn")
+            self.stream.sendMessage(MOVE, bytes([tile]))
             self.checkBoardCondition()
 
-    def playTileEight(self, event = None) -> None:
-        """Play out a player1 turn on tile eight if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile8Button
-
-        Updates the gameboard with an X on tile eight, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(8, "X")
-            self.tile8Value.set(self.playerBoard.getGameBoardTile(8))
-            self.tile8Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("8".encode())
-            self.checkBoardCondition()
-
-    def playTileNine(self, event = None) -> None:
-        """Play out a player1 turn on tile nine if player1 is allowed to make a move.
-
-        Event: triggered by clicking on tile9Button
-
-        Updates the gameboard with an X on tile nine, switches turns, sends the move to player2, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        if self.canMove:
-            self.playerBoard.updateGameBoard(9, "X")
-            self.tile9Value.set(self.playerBoard.getGameBoardTile(9))
-            self.tile9Button.grid_forget()
-            self.playerBoard.setLastPlayer(self.playerBoard.getPlayer1Name())
-            self.playerTurn.set(f"{self.playerBoard.getPlayer2Name()}'s Turn")
-            self.s.sendall("9".encode())
-            self.checkBoardCondition()
-
-    def tileOnePlayed(self) -> None:
-        """Play out player2's move on tile one after receiving player2's move.
-
-        Updates the gameboard with an O on tile one, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        self.playerBoard.updateGameBoard(1, "O")
-        self.tile1Value.set(self.playerBoard.getGameBoardTile(1))
-        self.tile1Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
-
-    def tileTwoPlayed(self) -> None:
-        """Play out player2's move on tile two after receiving player2's move.
-
-        Updates the gameboard with an O on tile two, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        self.playerBoard.updateGameBoard(2, "O")
-        self.tile2Value.set(self.playerBoard.getGameBoardTile(2))
-        self.tile2Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
+    def tilePlayed(self, tile: int) -> None:
+        """Play out player2's move on a tile after receiving player2's move.
 
-    def tileThreePlayed(self) -> None:
-        """Play out player2's move on tile three after receiving player2's move.
+        tile: The tile number (1 - boardSize squared) that player2 played.
 
-        Updates the gameboard with an O on tile three, switch to player1's turn, and
+        Updates the gameboard with an O on the tile, switch to player1's turn, and
         finally runs a check if the game has ended upon completion of the turn.
         """
-        self.playerBoard.updateGameBoard(3, "O")
-        self.tile3Value.set(self.playerBoard.getGameBoardTile(3))
-        self.tile3Button.grid_forget()
+        self.playerBoard.updateGameBoard(tile, "O")
+        self.scheduleChange(self.tileValues[tile - 1], self.tileValues[tile - 1].set, self.playerBoard.getGameBoardTile(tile))
+        self.scheduleChange(self.tileButtons[tile - 1], self.tileButtons[tile - 1].grid_forget)
         self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
+        self.scheduleChange(self.playerTurn, self.playerTurn.set, f"{self.playerBoard.getPlayer1Name()}'s Turn")
+        # upon completion of the other player's turn, player1 can make a move again, unless checkBoardCondition finds the game over
+        self.canMove = True
         self.checkBoardCondition()
 
-    def tileFourPlayed(self) -> None:
-        """Play out player2's move on tile four after receiving player2's move.
+    def checkBoardCondition(self) -> None:
+        """Check if a game has ended, either by a win or a tie, and responds to that condition.
 
-        Updates the gameboard with an O on tile four, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
+        Runs the BoardClass isWinner function, and if false, runs the BoardClass boardIsFull function to check
+        for a win or tie. If the game is over, widgets for starting a new game or ending the program are added.
+        If the game is not over, then triggers the other player's turn function if it was just this player's turn.
         """
-        self.playerBoard.updateGameBoard(4, "O")
-        self.tile4Value.set(self.playerBoard.getGameBoardTile(4))
-        self.tile4Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
+        if self.playerBoard.isWinner("X") or self.playerBoard.boardIsFull():
+            self.statsStore.saveStats(self.userName.get(), self.playerBoard)
+            # a click queued before the tile buttons are cleared must not play a move after the game is over
+            self.canMove = False
 
-    def tileFivePlayed(self) -> None:
-        """Play out player2's move on tile five after receiving player2's move.
+            # clearing the buttons of the unplayed tiles from the board to prevent interaction
+            for tile in range(1, len(self.tileButtons) + 1):
+                if self.playerBoard.getGameBoardTile(tile) == "":
+                    self.scheduleChange(self.tileButtons[tile - 1], self.tileButtons[tile - 1].grid_forget)
 
-        Updates the gameboard with an O on tile five, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        self.playerBoard.updateGameBoard(5, "O")
-        self.tile5Value.set(self.playerBoard.getGameBoardTile(5))
-        self.tile5Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
-
-    def tileSixPlayed(self) -> None:
-        """Play out player2's move on tile six after receiving player2's move.
+            # creating widgets for determining of playing again
+            self.scheduleChange(self.playAgainLabel, self.playAgainLabel.grid, row=self.gridColumns + 1, column=1, columnspan=self.gridColumns - 2)
+            self.scheduleChange(self.yesButton, self.yesButton.grid, row=self.gridColumns + 1, column=0)
+            self.scheduleChange(self.noButton, self.noButton.grid, row=self.gridColumns + 1, column=self.gridColumns - 1)
+        else:
+            if self.playerBoard.getPlayer1Name() == self.playerBoard.getLastPlayer():
+                self.otherPlayerTurn()
 
-        Updates the gameboard with an O on tile six, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
-        """
-        self.playerBoard.updateGameBoard(6, "O")
-        self.tile6Value.set(self.playerBoard.getGameBoardTile(6))
-        self.tile6Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
+    def scheduleChange(self, target: object, change: callable, *args, **options) -> None:
+        """Queue a change to a widget or variable, to be applied together with the rest of the frame's changes by render.
 
-    def tileSevenPlayed(self) -> None:
-        """Play out player2's move on tile seven after receiving player2's move.
+        A later change to the same target replaces the queued one, so only its final state is applied.
 
-        Updates the gameboard with an O on tile seven, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
+        target: The widget or tk variable that is changed.
+        change: The method making the change, such as the target's grid, grid_forget, or set method.
+        args: Positional arguments passed to change.
+        options: Keyword arguments passed to change, such as grid row and column.
         """
-        self.playerBoard.updateGameBoard(7, "O")
-        self.tile7Value.set(self.playerBoard.getGameBoardTile(7))
-        self.tile7Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
+        self.pendingChanges[id(target)] = partial(change, *args, **options)
 
-    def tileEightPlayed(self) -> None:
-        """Play out player2's move on tile eight after receiving player2's move.
+        if not self.renderScheduled:
+            self.renderScheduled = True
+            self.root.after_idle(self.render)
 
-        Updates the gameboard with an O on tile eight, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
+    def render(self) -> None:
+        """Apply every queued widget and variable change in one pass, so the window is laid out and redrawn once per frame.
         """
-        self.playerBoard.updateGameBoard(8, "O")
-        self.tile8Value.set(self.playerBoard.getGameBoardTile(8))
-        self.tile8Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
+        pendingChanges = self.pendingChanges
+        self.pendingChanges = {}
+        self.renderScheduled = False
 
-    def tileNinePlayed(self) -> None:
-        """Play out player2's move on tile nine after receiving player2's move.
+        for change in pendingChanges.values():
+            change()
 
-        Updates the gameboard with an O on tile nine, switch to player1's turn, and
-        finally runs a check if the game has ended upon completion of the turn.
+    def otherPlayerTurn(self) -> None:
+        """Begin the other player's turn, whose move is applied by pollMessages once it is received.
         """
-        self.playerBoard.updateGameBoard(9, "O")
-        self.tile9Value.set(self.playerBoard.getGameBoardTile(9))
-        self.tile9Button.grid_forget()
-        self.playerBoard.setLastPlayer(self.playerBoard.getPlayer2Name())
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
-        self.checkBoardCondition()
-
-    def checkBoardCondition(self) -> None:
-        """Check if a game has ended, either by a win or a tie, and responds to that condition.
+        # prevents player1 from making a move during the other player's turn
+        self.canMove = False
 
-        Runs the BoardClass isWinner function, and if false, runs the BoardClass boardIsFull function to check
-        for a win or tie. If the game is over, widgets for starting a new game or ending the program are added.
-        If the game is not over, then triggers the other player's turn function if it was just this player's turn.
+    def startReceiving(self) -> None:
+        """Start the reader thread that receives player2's messages, and begin polling for them on the Tk main thread.
         """
-        self.root.update()
-        
-        if self.playerBoard.isWinner("X") or self.playerBoard.boardIsFull():
-            # clearing buttons from the board to prevent interaction
-            self.tile1Button.grid_forget()
-            self.tile2Button.grid_forget()
-            self.tile3Button.grid_forget()
-            self.tile4Button.grid_forget()
-            self.tile5Button.grid_forget()
-            self.tile6Button.grid_forget()
-            self.tile7Button.grid_forget()
-            self.tile8Button.grid_forget()
-            self.tile9Button.grid_forget()
+        self.messageQueue = queue.Queue()
+        threading.Thread(target=self.receiveMessages, daemon=True).start()
+        self.root.after(POLL_INTERVAL, self.pollMessages)
 
-            # creating widgets for determining of playing again
-            self.playAgainLabel.grid(row=6, column=1, columnspan=3)
-            self.yesButton.grid(row=6, column=0)
-            self.noButton.grid(row=6, column=4)
-        else:
-            if self.playerBoard.getPlayer1Name() == self.playerBoard.getLastPlayer():
-                self.otherPlayerTurn()
+    def receiveMessages(self) -> None:
+        """Receive messages from player2 and put them on messageQueue, runs on the reader thread.
 
-    def otherPlayerTurn(self) -> None:
-        """Play out the other player's turn first by receiving their move and applying that move to the relevant tile.
+        Blocking on the socket here keeps the window responsive no matter how long player2 takes.
+        A (None, b"") message is put on the queue once the connection is closed.
         """
-        # prevents player1 from making a move during the other player's turn
-        self.canMove = False
-        player2Move = int(self.s.recv(1024).decode())
-        
-        if player2Move == 1:
-            self.tileOnePlayed()
-        elif player2Move == 2:
-            self.tileTwoPlayed()
-        elif player2Move == 3:
-            self.tileThreePlayed()
-        elif player2Move == 4:
-            self.tileFourPlayed()
-        elif player2Move == 5:
-            self.tileFivePlayed()
-        elif player2Move == 6:
-            self.tileSixPlayed()
-        elif player2Move == 7:
-            self.tileSevenPlayed()
-        elif player2Move == 8:
-            self.tileEightPlayed()
-        elif player2Move == 9:
-            self.tileNinePlayed()
-
-        # upon completion of the other player's turn, player1 can make a move again
-        self.canMove = True
+        try:
+            while True:
+                self.messageQueue.put(self.stream.recvMessage())
+        except OSError:
+            # ConnectionError is an OSError, raised when player2 closes the connection
+            self.messageQueue.put((None, b""))
+
+    def pollMessages(self) -> None:
+        """Handle every message waiting on messageQueue, then schedule the next poll unless the program is ending.
+        """
+        while True:
+            try:
+                messageType, payload = self.messageQueue.get_nowait()
+            except queue.Empty:
+                break
+
+            if messageType == MOVE:
+                self.tilePlayed(payload[0])
+            elif messageType == ACK:
+                # player2 confirmed the BYE, so the socket can be closed
+                self.stream.close()
+                self.displayStats()
+                return
+            else:
+                # player2 closed the connection or broke the protocol, so no more moves can be made; raising here
+                # would stop the polling and leave the window stuck
+                self.canMove = False
+                self.stream.close()
+                connectionStatus = "Connection lost." if messageType is None else f"Unexpected message type {messageType}. Connection closed."
+                self.scheduleChange(self.playerTurn, self.playerTurn.set, connectionStatus)
+                return
+
+        self.root.after(POLL_INTERVAL, self.pollMessages)
     
     def newGame(self, event = None) -> None:
         """Begin a new game by resetting the gameboard both internally and visually, message player2 to play again.
 
         Event: triggered by clicking on yesButton
         """
-        self.playAgainLabel.grid_forget()
-        self.yesButton.grid_forget()
-        self.noButton.grid_forget()
+        self.scheduleChange(self.playAgainLabel, self.playAgainLabel.grid_forget)
+        self.scheduleChange(self.yesButton, self.yesButton.grid_forget)
+        self.scheduleChange(self.noButton, self.noButton.grid_forget)
         
-        self.s.sendall("Play Again".encode())
+        self.stream.sendMessage(REMATCH)
         # resets the internal BoardClass gameboard
         self.playerBoard.resetGameBoard()
-        self.playerTurn.set(f"{self.playerBoard.getPlayer1Name()}'s Turn")
+        self.scheduleChange(self.playerTurn, self.playerTurn.set, f"{self.playerBoard.getPlayer1Name()}'s Turn")
 
-        # readd the buttons for interaction
-        self.tile1Button.grid(row=1, column=0)
-        self.tile2Button.grid(row=1, column=2)
-        self.tile3Button.grid(row=1, column=4)
-        self.tile4Button.grid(row=3, column=0)
-        self.tile5Button.grid(row=3, column=2)
-        self.tile6Button.grid(row=3, column=4)
-        self.tile7Button.grid(row=5, column=0)
-        self.tile8Button.grid(row=5, column=2)
-        self.tile9Button.grid(row=5, column=4)
-
-        # resetting visual gameboard values
-        self.tile1Value.set("")
-        self.tile2Value.set("")
-        self.tile3Value.set("")
-        self.tile4Value.set("")
-        self.tile5Value.set("")
-        self.tile6Value.set("")
-        self.tile7Value.set("")
-        self.tile8Value.set("")
-        self.tile9Value.set("")
+        # readd the buttons for interaction and reset the visual gameboard values
+        for tile in range(1, len(self.tileValues) + 1):
+            row, column = self.tileGridPosition(tile)
+            self.scheduleChange(self.tileButtons[tile - 1], self.tileButtons[tile - 1].grid, row=row, column=column)
+            self.scheduleChange(self.tileValues[tile - 1], self.tileValues[tile - 1].set, "")
 
         # new game starts on player1 turn so canMove is true
         self.canMove = True
@@ -589,23 +414,23 @@ class player1UI():
 
         Event: triggered by clicking on noButton
         """
-        self.playAgainLabel.grid_forget()
-        self.yesButton.grid_forget()
-        self.noButton.grid_forget()
+        self.scheduleChange(self.playAgainLabel, self.playAgainLabel.grid_forget)
+        self.scheduleChange(self.yesButton, self.yesButton.grid_forget)
+        self.scheduleChange(self.noButton, self.noButton.grid_forget)
 
-        self.s.sendall("Fun Times".encode())
-        # waits for message to allow the server to close connection before closing this socket
-        waitToClose = self.s.recv(1024).decode()
-        self.s.close()
-        self.displayStats()
+        # pollMessages closes the socket and displays stats once player2's ACK is received
+        self.stream.sendMessage(BYE)
 
     def displayStats(self) -> None:
         """Display the final stats returned from internal BoardClass computeStats() method, and quit the mainloop.
         """
+        self.statsStore.close()
         self.finalStats = tk.StringVar()
         self.finalStats.set(self.playerBoard.computeStats())
-        self.statsLabel = tk.Label(self.root, textvariable=self.finalStats, bg="pink", width=49, height=7)
-        self.statsLabel.grid(row=6, columnspan=5)
+        self.statsLabel = tk.Label(self.root, textvariable=self.finalStats, bg="pink", width=self.boardWidth, height=7)
+        self.scheduleChange(self.statsLabel, self.statsLabel.grid, row=self.gridColumns + 1, columnspan=self.gridColumns)
+        # the stats are rendered right away, as the mainloop stops before the window is idle again
+        self.render()
         self.root.quit()
 
 
@@ -0,0 +1,111 @@
+import socket
+import struct
+
+# Types of the messages sent between player1 and player2.
+HELLO = 1    # payload: board size byte, win length byte, then the UTF-8 user name
+MOVE = 2     # payload: one byte tile number
+REMATCH = 3  # no payload, player1 wants to play again
+BYE = 4      # no payload, player1 is done playing
+ACK = 5      # no payload, player2 confirms the BYE before closing
+ERROR = 7    # payload: the UTF-8 reason, sent in place of a reply to a refused HELLO or JOIN before closing
+
+# Every message starts with a 1 byte type and 2 byte payload length, in network byte order.
+HEADER = struct.Struct("!BH")
+
+class ProtocolError(Exception):
+    """Custom exception made to classify a message that was not expected at this point of the game.
+    """
+    pass
+
+class RequestRefused(ProtocolError):
+    """Custom exception made to classify an ERROR message, sent by a server or lobby that refused the connection.
+    """
+    pass
+
+def encodeMessage(messageType: int, payload: bytes = b"") -> bytes:
+    """Frame a message as its header followed by its payload.
+
+    messageType: One of the message type constants, such as MOVE.
+    payload: The bytes carried by the message.
+
+    Returns: The framed message bytes, ready to be sent.
+    """
+    return HEADER.pack(messageType, len(payload)) + payload
+
+def encodeHello(userName: str, boardSize: int, winLength: int) -> bytes:
+    """Build the payload of a HELLO message.
+
+    Returns: The board size and win length bytes followed by the UTF-8 user name.
+    """
+    return bytes((boardSize, winLength)) + userName.encode()
+
+def decodeHello(payload: bytes) -> tuple[str, int, int]:
+    """Read the payload of a HELLO message.
+
+    Returns: A tuple of the user name, board size, and win length.
+    """
+    return payload[2:].decode(), payload[0], payload[1]
+
+class MessageStream:
+    """A class that sends and receives framed messages over a socket connection.
+
+    Received bytes are kept in a buffer until a whole message has arrived, so messages that TCP splits
+    across several reads, or merges into one read, are still received one at a time and in order.
+
+    Attributes:
+        sock (socket): Socket type object of the connection with the other player.
+        buffer (bytearray): Received bytes that have not been returned as a message yet.
+    """
+
+    def __init__(self, sock: socket):
+        self.sock = sock
+        self.buffer = bytearray()
+
+    def sendMessage(self, messageType: int, payload: bytes = b"") -> None:
+        """Send one framed message over the socket.
+
+        messageType: One of the message type constants, such as MOVE.
+        payload: The bytes carried by the message.
+        """
+        self.sock.sendall(encodeMessage(messageType, payload))
+
+    def recvMessage(self) -> tuple[int, bytes]:
+        """Receive the next whole message, reading from the socket only when the buffer does not hold one.
+
+        Returns: A tuple of the message type and the payload bytes.
+        """
+        while True:
+            if len(self.buffer) >= HEADER.size:
+                messageType, payloadLength = HEADER.unpack_from(self.buffer)
+                messageEnd = HEADER.size + payloadLength
+
+                if len(self.buffer) >= messageEnd:
+                    payload = bytes(self.buffer[HEADER.size:messageEnd])
+                    del self.buffer[:messageEnd]
+                    return messageType, payload
+
+            data = self.sock.recv(4096)
+            if not data:
+                raise ConnectionError("The other player closed the connection.")
+            self.buffer += data
+
+    def expectMessage(self, messageType: int) -> bytes:
+        """Receive the next message, which must be of the given type.
+
+        messageType: The message type constant that is expected next.
+
+        Returns: The payload bytes of the message.
+        """
+        receivedType, payload = self.recvMessage()
+
+        if receivedType == ERROR:
+            raise RequestRefused(payload.decode())
+        elif receivedType != messageType:
+            raise ProtocolError(f"Expected message type {messageType}, received {receivedType}.")
+
+        return payload
+
+    def close(self) -> None:
+        """Close the socket connection.
+        """
+        self.sock.close()